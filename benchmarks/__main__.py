@@ -0,0 +1,51 @@
+import argparse
+import os
+import platform
+import sys
+from campground.render import offscreen
+offscreen.use_platform()
+from benchmarks import suite
+
+baseline_path = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m benchmarks",
+                                 description="Time the simulation and render hot paths against a stored baseline")
+    ap.add_argument("patterns", nargs="*", help="glob patterns of case names to run (default: all)")
+    ap.add_argument("--no-render", action="store_true", help="skip the cases that need an offscreen GL context")
+    ap.add_argument("--baseline", default=baseline_path)
+    ap.add_argument("--save", action="store_true", help="record these results as the new baseline")
+    ap.add_argument("--threshold", type=float, default=0.25,
+                    help="fractional slowdown or memory growth that counts as a regression")
+    ap.add_argument("--ms-slack", type=float, default=0.1,
+                    help="absolute slowdown in ms a case may show on top of the threshold")
+    ap.add_argument("--spread", type=float, default=1.5,
+                    help="interquartile ranges of a case's passes it may slow down by, when that beats --ms-slack")
+    ap.add_argument("--runs", type=int, default=3,
+                    help="passes over the cases; each keeps its median (default: 3)")
+    ap.add_argument("--json", metavar="PATH", help="also write the results to PATH")
+    args = ap.parse_args(argv)
+
+    import benchmarks.sim_cases
+    groups = ["sim"]
+    if not args.no_render:
+        import benchmarks.render_cases
+        groups.append("render")
+    cases = suite.select(args.patterns, groups)
+    results = suite.run_all(cases, runs=args.runs)
+
+    if args.json:
+        suite.save_baseline(args.json, results)
+    if args.save:
+        suite.save_baseline(args.baseline, results, {"python": platform.python_version(),
+                                                     "machine": platform.machine()})
+        print("saved %d results to %s" % (len(results), args.baseline))
+        return 0
+    bad = suite.regressions(results, suite.load_baseline(args.baseline), args.threshold,
+                            ms_slack=args.ms_slack, spread=args.spread)
+    for name, kind, old, new in bad:
+        print("REGRESSION %-32s %-6s %10.3f -> %10.3f (%+.0f%%)" % (name, kind, old, new, (new / old - 1) * 100))
+    return 1 if bad else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
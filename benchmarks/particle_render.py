@@ -0,0 +1,81 @@
+import argparse
+import time
+from campground.render import offscreen
+offscreen.use_platform()
+import numpy as np
+from OpenGL.GL import *
+from OpenGL.GLU import *
+from campground.render.particles import RainRenderer, SmokeRenderer
+
+def legacy_rain(pos):
+    glLineWidth(2.0)
+    glBegin(GL_LINES)
+    glColor3f(0.7,0.8,1.0)
+    for x, y, z in pos.tolist():
+        glVertex3f(x, y, z)
+        glVertex3f(x, y-1, z)
+    glEnd()
+    glLineWidth(1.0)
+
+def legacy_smoke(quad, pos, size, alpha):
+    for (x, y, z), s, a in zip(pos.tolist(), size.tolist(), alpha.tolist()):
+        glColor4f(0.8, 0.8, 0.8, a)
+        glPushMatrix()
+        glTranslatef(x, y, z)
+        gluSphere(quad, s, 8, 8)
+        glPopMatrix()
+
+def time_frames(draw, frames):
+    draw()
+    glFinish()
+    t0 = time.perf_counter()
+    for _ in range(frames):
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        draw()
+        glFinish()
+    return (time.perf_counter() - t0) / frames * 1000.0
+
+def main():
+    ap = argparse.ArgumentParser(description="Immediate-mode vs streamed VBO particle rendering "
+                                             "(set PYOPENGL_PLATFORM=osmesa to use OSMesa instead of EGL)")
+    ap.add_argument("--drops", type=int, default=20000)
+    ap.add_argument("--puffs", type=int, default=500)
+    ap.add_argument("--frames", type=int, default=30)
+    ap.add_argument("--size", default="800x600")
+    args = ap.parse_args()
+    w, h = map(int, args.size.split("x"))
+    ctx = offscreen.create_context(w, h)
+
+    glViewport(0, 0, w, h)
+    glEnable(GL_DEPTH_TEST)
+    glEnable(GL_BLEND)
+    glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+    glMatrixMode(GL_PROJECTION)
+    gluPerspective(45, w / h, 0.1, 100.0)
+    glMatrixMode(GL_MODELVIEW)
+    gluLookAt(0, 2, 30, 0, 5, 0, 0, 1, 0)
+
+    rng   = np.random.default_rng(0)
+    drops = rng.uniform((-20,0,-20), (20,20,20), (args.drops, 3)).astype(np.float32)
+    puffs = rng.uniform((-2,0,-2), (2,3,2), (args.puffs, 3)).astype(np.float32)
+    age   = rng.uniform(0, 3, args.puffs).astype(np.float32)
+    size, alpha = 0.2 + 0.15 * age, 1.0 - age / 3.0
+
+    rain, smoke, quad = RainRenderer(), SmokeRenderer(), gluNewQuadric()
+    rows = [
+        ("rain",  "immediate", time_frames(lambda: legacy_rain(drops), args.frames)),
+        ("rain",  "vbo",       time_frames(lambda: rain.draw(drops), args.frames)),
+        ("smoke", "immediate", time_frames(lambda: legacy_smoke(quad, puffs, size, alpha), args.frames)),
+        ("smoke", "vbo",       time_frames(lambda: smoke.draw(puffs, size, alpha), args.frames)),
+    ]
+    print(glGetString(GL_RENDERER).decode())
+    print("%-6s %-10s %10s" % ("layer", "path", "ms/frame"))
+    for layer, path, ms in rows:
+        print("%-6s %-10s %10.3f" % (layer, path, ms))
+    gluDeleteQuadric(quad)
+    rain.delete()
+    smoke.delete()
+    ctx.destroy()
+
+if __name__ == "__main__":
+    main()
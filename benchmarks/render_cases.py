@@ -0,0 +1,89 @@
+import os
+import numpy as np
+from OpenGL.GL import GL_RGB, GL_UNSIGNED_BYTE, glFinish, glReadPixels, glViewport
+from benchmarks.suite import case
+from campground.camera import Camera
+from campground.render import offscreen
+from campground.render.scene import SceneRenderer, s_width, s_height
+from campground.scene import make_simulation, sites_path
+
+size = (s_width, s_height)
+_ctx = None
+
+def context():
+    # One offscreen context for every render case; creating several is flaky on some drivers
+    global _ctx
+    if _ctx is None:
+        _ctx = offscreen.create_context(*size)
+        glViewport(0, 0, *size)
+    return _ctx
+
+def frame_case(name, rain=False, night=False, fog=False, sites=sites_path, shaders=None):
+    def factory():
+        context()
+        sim = make_simulation(seed=0, sites=sites)
+        sim.is_day = not night
+        sim.weather.mist = 0.03 if fog else 0.0
+        sim.weather.set_state("rain" if rain else "clear", blend=0.0)
+        renderer = SceneRenderer(Camera(), sim, shaders=shaders)
+        sim.run(240)
+
+        def run():
+            renderer.render(sim)
+            glFinish()
+        run.close = renderer.delete
+        return run
+    case("frame." + name, items=1, unit="frames", group="render")(factory)
+
+def frame_pixels(renderer, sim):
+    renderer.render(sim)
+    data = glReadPixels(0, 0, size[0], size[1], GL_RGB, GL_UNSIGNED_BYTE)
+    return np.frombuffer(data, np.uint8).reshape(size[1], size[0], 3).astype(np.float64)
+
+def check_flash(sim, fixed, shaded):
+    # A lightning flash should light the night storm the same on both paths: same brightening
+    # over the whole frame, and frames that match to within shading differences
+    w = sim.weather
+    # One frame each first: the first after construction can still carry GL state the other
+    # renderer left behind, and lights the fixed path differently
+    for r in (fixed, shaded):
+        r.render(sim)
+    frames = {}
+    for flash in (False, True):
+        w.lightning_active, w.lightning_intensity = flash, 0.8 if flash else 0.0
+        frames[flash] = [frame_pixels(r, sim) for r in (fixed, shaded)]
+    w.lightning_active, w.lightning_intensity = False, 0.0
+    gain = [frames[True][i].mean() - frames[False][i].mean() for i in (0, 1)]
+    diff = np.abs(frames[True][0] - frames[True][1]).mean()
+    if min(gain) < 10.0 or abs(gain[0] - gain[1]) > 0.1 * gain[0] or diff > 8.0:
+        raise AssertionError("fixed and shaded lightning differ: gain %.1f vs %.1f, mean diff %.1f"
+                             % (gain[0], gain[1], diff))
+
+def storm_case():
+    def factory():
+        context()
+        sim = make_simulation(seed=0)
+        sim.is_day = False
+        sim.weather.set_state("storm", blend=0.0)
+        fixed = SceneRenderer(Camera(), sim)
+        shaded = SceneRenderer(Camera(), sim, shaders="vertex")
+        sim.run(240)
+        check_flash(sim, fixed, shaded)
+        fixed.delete()
+
+        def run():
+            shaded.render(sim)
+            glFinish()
+        run.close = shaded.delete
+        return run
+    case("frame.storm_night_shaded", items=1, unit="frames", group="render")(factory)
+
+frame_case("clear")
+frame_case("rain_night", rain=True, night=True)
+frame_case("rain_fog", rain=True, fog=True)
+campground = os.path.join(os.path.dirname(sites_path), "campground.json")
+frame_case("campground_night", night=True, sites=campground)
+frame_case("rain_fog_shaded", rain=True, fog=True, shaders="vertex")
+frame_case("campground_night_shaded", night=True, sites=campground, shaders="vertex")
+frame_case("campground_night_pixel", night=True, sites=campground, shaders="pixel")
+storm_case()
@@ -0,0 +1,148 @@
+import math
+from collections import deque
+import numpy as np
+from benchmarks.suite import case
+from campground import lsystem, meshes, scene
+from campground.heightmap import Heightmap, chunk_mesh
+from campground.particles import ParticleEmitter
+from campground.weather import WeatherSystem
+
+step = 1 / 60
+
+def weather_case(n, ground=None, walk=0.0):
+    def factory():
+        # Spawn rate matched to the mean drop lifetime (~1.4 s) keeps the pool near full
+        w = WeatherSystem(rain_cap=n, rain_rate=n / 1.4, rng=np.random.default_rng(0), ground=ground)
+        w.set_state("storm", blend=0.0)
+        w.spawn_rain(n)
+        for _ in range(60):
+            w.update(step)
+
+        def update():
+            # Walking moves the volume, so drops wrap and the height patch re-samples
+            w.center[0] += walk * step
+            w.update(step)
+        return update
+    name = "weather.update[%d%s]" % (n, ",terrain" if ground is not None else "")
+    case(name, items=n, unit="drops")(factory)
+
+for n in (1000, 10000, 100000):
+    weather_case(n)
+weather_case(10000, Heightmap(0), walk=5.0)
+
+def make_emitter(sources):
+    e = ParticleEmitter(rng=np.random.default_rng(0))
+    for i in range(sources):
+        e.add_source(i % 16, 0.0, i // 16)
+    return e
+
+def smoke_case(sources):
+    e = make_emitter(sources)
+    live = len(e.pos)
+
+    def update():
+        # Warm up past one lifetime so expiry is part of the measured work
+        for _ in range(int(e.life / step) + 10):
+            e.update(step)
+
+        def run():
+            # A frame's worth: the tick, then the puffs worked out as the renderer reads them
+            e.update(step)
+            return e.pos
+        return run
+    case("smoke.update[%d]" % sources, items=live, unit="puffs")(update)
+
+    def spawn():
+        return make_emitter(sources).spawn
+    case("smoke.spawn[%d]" % sources, items=e.burst * sources, unit="puffs")(spawn)
+
+for n in (1, 16, 128):
+    smoke_case(n)
+
+def headless_case(state):
+    # Ten seconds of the scene's schedule, throughput in simulated seconds per second (the
+    # headless speedup). Clear weather with the fires lit should stay in the thousands; a storm
+    # is bound by its ~900 live drops and the agreed floor there is 100x
+    def factory():
+        sim = scene.make_simulation(seed=0)
+        sim.weather.set_state(state, blend=0.0)
+        sim.run(600)
+        return lambda: sim.run(600)
+    case("headless.%s[600]" % state, items=600 * step, unit="sim s", repeat=3)(factory)
+
+for state in ("clear", "storm"):
+    headless_case(state)
+
+rules = {"F": "FF+[+F-F-F]-[-F+F+F]"}
+
+def lsystem_case(iterations):
+    size = lsystem.symbol_counts("F", rules, iterations)
+    size = sum(size.values())
+    frozen = lsystem.freeze(rules)
+    # Uncached expansion; cache hits are a dict lookup and not worth timing
+    case("lsystem.generate[%d]" % iterations, items=size, unit="symbols")(
+        lambda: lambda: lsystem._expand.__wrapped__("F", frozen, iterations))
+    case("lsystem.iter[%d]" % iterations, items=size, unit="symbols")(
+        lambda: lambda: deque(lsystem.iter_symbols("F", rules, iterations), 0))
+
+for it in range(1, 6):
+    lsystem_case(it)
+
+def turtle_case(iterations):
+    symbols = lsystem.expand("F", rules, iterations)
+    segments = len(lsystem.interpret(symbols)[0])
+    case("turtle.interpret[%d]" % iterations, items=segments, unit="segments")(
+        lambda: lambda: lsystem.interpret(symbols))
+    frozen = lsystem.freeze(rules)
+    case("turtle.mesh[%d]" % iterations, items=segments, unit="segments")(
+        lambda: lambda: meshes._lsystem_tree.__wrapped__("F", frozen, iterations, 5, 25.0, iterations, "octa"))
+
+for it in (2, 3, 4):
+    turtle_case(it)
+
+case("lsystem.counts[20]", items=1, unit="calls")(lambda: lambda: lsystem.symbol_counts("F", rules, 20))
+
+ground = Heightmap(0)
+
+def check_phases(pts, x0, r):
+    # Poisson-disk points should sit in every (cell mod 3) phase of the sampler's grid about
+    # equally; a sampler that favours some phases leaves empty columns on a 3-cell lattice
+    cs = r / math.sqrt(2.0)
+    ci = ((pts - x0) / cs).astype(np.int64) % 3
+    ph = np.bincount(ci[:, 0] * 3 + ci[:, 1], minlength=9)
+    mean = len(pts) / 9
+    if np.abs(ph - mean).max() > 5 * math.sqrt(mean):
+        raise AssertionError("uneven poisson_disk phase occupancy: %s" % ph.tolist())
+
+def placement_case(count, radius):
+    def factory():
+        grid, _ = scene.place_trees(np.random.default_rng(0), count, radius, ground)
+        check_phases(grid.positions(), -radius, scene.tree_spacing)
+        return lambda: scene.place_trees(np.random.default_rng(0), count, radius, ground)
+    case("trees.place[%d]" % count, items=count, unit="trees", repeat=3)(factory)
+
+placement_case(scene.tree_count, scene.sp_rad)
+placement_case(10000, 120.0)
+
+def terrain_build():
+    return lambda: chunk_mesh(ground, (3, -2), 32.0, 32)
+
+case("terrain.build[32x32]", items=33 * 33, unit="vertices")(terrain_build)
+
+def height_at():
+    # Scattered far past any loaded terrain, so nearly every lookup samples its corners
+    hm = Heightmap(0)
+    xz = np.random.default_rng(0).uniform(-1000, 1000, (2, 100000))
+    return lambda: hm.height_at(*xz)
+
+def height_at_loaded():
+    # Inside the chunks a Terrain around the origin would have streamed in
+    hm = Heightmap(0)
+    for kx in range(-4, 4):
+        for kz in range(-4, 4):
+            hm.chunk_grid((kx, kz), 32.0, 32)
+    xz = np.random.default_rng(0).uniform(-128, 128, (2, 100000))
+    return lambda: hm.height_at(*xz)
+
+case("terrain.height_at[100000]", items=100000, unit="lookups")(height_at)
+case("terrain.height_at[100000,loaded]", items=100000, unit="lookups")(height_at_loaded)
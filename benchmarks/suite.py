@@ -0,0 +1,132 @@
+import fnmatch
+import json
+import time
+import tracemalloc
+
+CASES = []
+
+class Case:
+    def __init__(self, name, factory, items=1, unit="items", number=None, repeat=5, group="sim"):
+        self.name    = name
+        self.factory = factory
+        self.items   = items
+        self.unit    = unit
+        self.number  = number
+        self.repeat  = repeat
+        self.group   = group
+
+def case(name, items=1, unit="items", number=None, repeat=5, group="sim"):
+    # Register a factory that does the setup and returns the zero-argument callable to time
+    def deco(factory):
+        CASES.append(Case(name, factory, items, unit, number, repeat, group))
+        return factory
+    return deco
+
+def calibrate(run, target=0.05):
+    # Like timeit's autorange: loop count that fills `target` seconds, so sub-microsecond cases aren't noise
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            run()
+        if time.perf_counter() - t0 >= target or number >= 1 << 20:
+            return number
+        number *= 4
+
+def measure(c):
+    run = c.factory()
+    number = c.number or calibrate(run)
+    best = float("inf")
+    for _ in range(c.repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            run()
+        best = min(best, (time.perf_counter() - t0) / number)
+    # Memory in a separate pass: tracemalloc slows the timed loop down several-fold
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    close = getattr(run, "close", None)
+    if close:
+        close()
+    return {
+        "ms":         best * 1000.0,
+        "throughput": c.items / best if best > 0 else float("inf"),
+        "unit":       c.unit + "/s",
+        "peak_kb":    peak / 1024.0,
+    }
+
+def select(patterns=None, groups=None):
+    out = []
+    for c in CASES:
+        if groups and c.group not in groups: continue
+        if patterns and not any(fnmatch.fnmatch(c.name, p) for p in patterns): continue
+        out.append(c)
+    return out
+
+def quantile(xs, q):
+    # Linear between the closest ranks, as numpy.quantile does by default
+    xs = sorted(xs)
+    f = q * (len(xs) - 1)
+    k = int(f)
+    return xs[k] if k + 1 == len(xs) else xs[k] + (xs[k + 1] - xs[k]) * (f - k)
+
+def median(xs):
+    return quantile(xs, 0.5)
+
+def iqr(xs):
+    return quantile(xs, 0.75) - quantile(xs, 0.25)
+
+def run_all(cases, out=print, runs=1):
+    # With runs > 1 the whole list goes round that many times and each case keeps its median
+    # pass: a slow patch on the machine then lands in one sample of every case, not all of one's.
+    # The interquartile range of the passes goes with it as that case's noise.
+    passes = {c.name: [] for c in cases}
+    for k in range(runs):
+        for c in cases:
+            r = measure(c)
+            passes[c.name].append(r)
+            tag = "" if runs == 1 else " [%d/%d]" % (k + 1, runs)
+            out("%-32s %10.3f ms %14.0f %-14s %10.1f KiB%s" % (c.name, r["ms"], r["throughput"], r["unit"], r["peak_kb"], tag))
+    results = {}
+    for c in cases:
+        ms = median([r["ms"] for r in passes[c.name]])
+        results[c.name] = {
+            "ms":         ms,
+            "iqr_ms":     iqr([r["ms"] for r in passes[c.name]]),
+            "throughput": c.items / ms * 1000.0 if ms > 0 else float("inf"),
+            "unit":       c.unit + "/s",
+            "peak_kb":    median([r["peak_kb"] for r in passes[c.name]]),
+        }
+    return results
+
+def load_baseline(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def save_baseline(path, results, meta=None):
+    base = load_baseline(path)
+    base.update(results)
+    if meta:
+        base["_meta"] = meta
+    with open(path, "w") as f:
+        json.dump(base, f, indent=1, sort_keys=True)
+
+def regressions(results, baseline, threshold=0.25, mem_slack_kb=64.0, ms_slack=0.1, spread=1.5):
+    # A case regresses when it is `threshold` slower, or uses that much more memory, beyond an
+    # absolute slack on each so noise and tiny allocations don't trip it. The time slack is
+    # `spread` interquartile ranges of the noisier of the two runs, and never under ms_slack.
+    bad = []
+    for name, r in results.items():
+        b = baseline.get(name)
+        if not b: continue
+        noise = max(r.get("iqr_ms", 0.0), b.get("iqr_ms", 0.0))
+        if r["ms"] > b["ms"] * (1.0 + threshold) + max(ms_slack, spread * noise):
+            bad.append((name, "time", b["ms"], r["ms"]))
+        if r["peak_kb"] > b["peak_kb"] * (1.0 + threshold) + mem_slack_kb:
+            bad.append((name, "memory", b["peak_kb"], r["peak_kb"]))
+    return bad
@@ -0,0 +1,30 @@
+# Camping ground simulation. The modules directly in this package are the simulation layer:
+# NumPy and pyglm only, no GL or pygame, so headless runs and worker processes stay light.
+# Drawing lives in campground.render, the window and CLI in campground.app.
+import importlib
+
+_exports = {
+    "Simulation":      "simulation",
+    "run_headless":    "simulation",
+    "make_simulation": "scene",
+    "place_trees":     "scene",
+    "save_scene":      "snapshot",
+    "load_scene":      "snapshot",
+    "SceneLoader":     "loader",
+    "WeatherSystem":   "weather",
+    "DayNightCycle":   "day_night_cycle",
+    "Camera":          "camera",
+    "Campsites":       "campsites",
+    "Heightmap":       "heightmap",
+    "LSystem":         "lsystem",
+    "Tree":            "tree",
+    "Profiler":        "profiler",
+}
+
+def __getattr__(name):
+    mod = _exports.get(name)
+    if mod is None:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    value = getattr(importlib.import_module("%s.%s" % (__name__, mod)), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,3 @@
+from campground.app import main
+
+main()
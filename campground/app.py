@@ -0,0 +1,156 @@
+import argparse
+import sys
+from campground.camera import Camera
+from campground.keys import K_w, K_s, K_a, K_d, K_SPACE, K_LSHIFT, K_ESCAPE, K_F3
+from campground.profiler import Profiler, instrument_gl
+from campground.replay import FrameInput, InputRecorder, InputPlayer
+from campground.scene import apply_input, state_digest, add_scene_args, apply_options
+from campground.simulation import run_headless
+from campground.snapshot import open_simulation, save_scene
+
+# pygame and GL are imported inside the functions that open a window, so headless runs
+# never load them
+move_keys = (K_w, K_s, K_a, K_d, K_SPACE, K_LSHIFT)
+
+def poll_input(pygame, dt):
+    # One frame of pygame input as a FrameInput; None once the user quits
+    frame = FrameInput(dt)
+    for ev in pygame.event.get():
+        if ev.type == pygame.QUIT or (ev.type == pygame.KEYDOWN and ev.key == K_ESCAPE):
+            return None
+        elif ev.type == pygame.KEYDOWN:
+            frame.keys.append(ev.key)
+        elif ev.type == pygame.MOUSEBUTTONDOWN:
+            if ev.button == 4:
+                frame.wheel.append(1)
+            elif ev.button == 5:
+                frame.wheel.append(-1)
+        elif ev.type == pygame.MOUSEMOTION and pygame.mouse.get_pressed()[0]:
+            frame.mouse.append(ev.rel)
+    pressed = pygame.key.get_pressed()
+    frame.held = [k for k in move_keys if pressed[k]]
+    return frame
+
+def cull_lines(culler):
+    rows = []
+    for name, st in culler.stats.items():
+        lod = " lod " + "/".join(map(str, st["lod"])) if "lod" in st else ""
+        rows.append("%-8s vis %5d cull %5d%s" % (name, st["visible"], st["culled"], lod))
+    return rows
+
+def run_interactive(sim, recorder=None, player=None, count_gl=False, shaders=None):
+    import pygame
+    from campground.render.overlay import ProfilerOverlay
+    from campground.render.scene import SceneRenderer, gl_modules, s_width, s_height
+    pygame.init()
+    pygame.display.set_mode((s_width, s_height), pygame.DOUBLEBUF | pygame.OPENGL)
+    pygame.mouse.set_visible(True)
+    clock = pygame.time.Clock()
+
+    cam = Camera()
+    renderer = SceneRenderer(cam, sim, progressive=True, shaders=shaders)
+    loader = renderer.loader
+    frames = iter(player) if player else None
+    prof = sim.profiler
+    overlay = ProfilerOverlay(prof, s_height) if prof.enabled else None
+    if count_gl:
+        instrument_gl(prof, *gl_modules())
+
+    while True:
+        prof.begin_frame()
+        with prof.scope("clock.tick"):
+            dt = clock.tick(60) / 1000.0
+        with prof.scope("events"):
+            frame = poll_input(pygame, dt)
+        if frame is None:
+            break
+        if frames is not None:
+            frame = next(frames, None)
+            if frame is None:
+                break
+        if recorder:
+            recorder.write(frame)
+        if overlay and K_F3 in frame.keys:
+            overlay.toggle()
+            if not count_gl:
+                instrument_gl(prof, *gl_modules())
+                count_gl = True
+        apply_input(sim, cam, frame)
+        renderer.render(sim)
+        if loader is not None:
+            if loader.loading:
+                pygame.display.set_caption("Camping ground (loading %d%%)" % (100 * loader.progress()))
+            else:
+                pygame.display.set_caption("Camping ground")
+                print("\n".join(loader.report()), file=sys.stderr)
+                loader = None
+        if overlay:
+            overlay.draw(cull_lines(renderer.culler))
+        with prof.scope("flip"):
+            pygame.display.flip()
+        prof.end_frame()
+
+    renderer.delete()
+    pygame.quit()
+    return cam
+
+def run_replay_headless(sim, player):
+    cam = Camera()
+    for frame in player:
+        apply_input(sim, cam, frame)
+    print(dict(sim.stats(), frames=len(player), digest=state_digest(sim, cam)))
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Camping ground simulation")
+    ap.add_argument("--headless", type=int, nargs="?", const=0, metavar="TICKS",
+                    help="advance TICKS fixed steps as fast as possible without a window "
+                         "(with --replay: run the recorded frames instead)")
+    ap.add_argument("--step", type=float, default=1/60, help="fixed simulation step in seconds")
+    ap.add_argument("--report", type=int, default=0, metavar="TICKS", help="print stats every TICKS ticks")
+    ap.add_argument("--seed", type=int, help="seed for every random stream (random if omitted)")
+    ap.add_argument("--record", metavar="PATH", help="write per-frame input to PATH for replay")
+    ap.add_argument("--replay", metavar="PATH", help="replay input recorded with --record")
+    ap.add_argument("--profile", action="store_true",
+                    help="time each stage and count GL calls (F3 toggles the overlay)")
+    ap.add_argument("--profile-out", metavar="PATH", help="write per-frame timings to PATH (.csv or .json)")
+    ap.add_argument("--shaders", nargs="?", const="vertex", choices=("vertex", "pixel"),
+                    help="light, fog and flash in GLSL, fires lit per vertex (default) or per pixel; "
+                         "falls back to fixed function where shaders can't run")
+    ap.add_argument("--save-scene", metavar="PATH", help="snapshot the scene to PATH on exit (load it with --scene)")
+    add_scene_args(ap)
+    return ap.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    player = InputPlayer(args.replay) if args.replay else None
+    if player:
+        args.seed, args.step = player.seed, player.step
+        for k, v in player.options.items():
+            setattr(args, k, v)
+    sim = open_simulation(args.step, args.seed, args.sites, args.scene)
+    sim.profiler = Profiler(record=bool(args.profile_out))
+    apply_options(sim, args)
+    if args.headless is not None:
+        if player:
+            run_replay_headless(sim, player)
+        else:
+            run_headless(sim, args.headless, args.report)
+        if args.profile_out:
+            sim.profiler.dump(args.profile_out)
+        if args.save_scene:
+            save_scene(args.save_scene, sim)
+        return
+    options = {k: getattr(args, k) for k in ("rain", "lightning", "fog", "night", "sites", "scene", "day_length", "time",
+                                          "weather", "weather_cycle")}
+    recorder = InputRecorder(args.record, sim.rngs.seed, args.step, options) if args.record else None
+    try:
+        cam = run_interactive(sim, recorder, player, count_gl=args.profile, shaders=args.shaders)
+    finally:
+        if recorder:
+            recorder.close()
+        if args.profile_out:
+            sim.profiler.dump(args.profile_out)
+    if args.save_scene:
+        save_scene(args.save_scene, sim)
+    if args.record or args.replay:
+        print(dict(sim.stats(), digest=state_digest(sim, cam)))
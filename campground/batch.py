@@ -0,0 +1,133 @@
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from campground import scene, weather
+from campground.profiler import Profiler
+
+default_grid = {
+    "rain":      [False, True],
+    "lightning": [False, True],
+    "fog":       [0.0, 0.03],
+    "night":     [False, True],
+    "rain_cap":  [1000, 10000],
+    "trees":     [1000],
+}
+
+def scenarios(grid, repeats=1, seed=0):
+    # Cartesian product of the grid; each run gets its own seed from (seed, scenario, repeat),
+    # so results don't depend on which worker picks a task up or in what order
+    keys = sorted(grid)
+    tasks = []
+    for i, values in enumerate(itertools.product(*(grid[k] for k in keys))):
+        params = dict(zip(keys, values))
+        if params.get("lightning") and not params.get("rain"):
+            continue  # lightning only strikes while it rains
+        for r in range(repeats):
+            ss = np.random.SeedSequence(seed, spawn_key=(i, r))
+            tasks.append({"scenario": i, "repeat": r, "seed": int(ss.generate_state(1, np.uint64)[0]),
+                          "params": params})
+    return tasks
+
+def run_scenario(task, ticks, step=1/60, sample_every=60):
+    p = task["params"]
+    sim = scene.make_simulation(step, task["seed"], p.get("sites", scene.sites_path))
+    if "rain_cap" in p:
+        # Spawn rate scales with the cap so a bigger pool actually fills
+        cap = p["rain_cap"]
+        rate = p.get("rain_rate", cap * weather.rain_rate / weather.rain_cap)
+        sim.weather = weather.WeatherSystem(cap, rate, rng=sim.rngs["weather"], ground=sim.ground)
+    sim.day.length = p.get("day_length", 0.0)
+    sim.day.set_time(0.75 if p.get("night") else 0.25)
+    sim.is_day = sim.day.mode == "day"
+    w = sim.weather
+    w.auto = bool(p.get("weather_cycle"))
+    w.mist = float(p.get("fog", 0.0))
+    w.set_state(p.get("weather") or ("storm" if p.get("lightning") else "rain" if p.get("rain") else "clear"), blend=0.0)
+    sim.profiler = Profiler(window=ticks)
+
+    rain, smoke = [], []
+    t0 = time.perf_counter()
+    done = 0
+    while done < ticks:
+        n = min(sample_every, ticks - done)
+        sim.run(n)
+        done += n
+        stats = sim.stats()
+        rain.append(stats["rain"])
+        smoke.append(stats["smoke"])
+    wall = time.perf_counter() - t0
+    cost = sim.profiler.summary()
+
+    out = {
+        "scenario": task["scenario"], "repeat": task["repeat"], "seed": task["seed"], "params": p,
+        "ticks": ticks, "sim_time": sim.time, "wall": wall,
+        "step_ms": {k: cost["frame"][k] for k in ("mean", "p95", "max")},
+        "scope_ms": {name: s["mean"] for name, s in cost.items() if name != "frame" and name not in sim.profiler.counters},
+        "strikes": sim.strikes, "strikes_per_min": sim.strikes * 60.0 / sim.time if sim.time else 0.0,
+        "rain_mean": float(np.mean(rain)), "rain_max": int(np.max(rain)),
+        "smoke_mean": float(np.mean(smoke)), "smoke_max": int(np.max(smoke)),
+        "pid": os.getpid(),
+    }
+    if p.get("trees"):
+        # Placement lives on the render side; time it on the same density as the default scene
+        radius = scene.sp_rad * (p["trees"] / scene.tree_count) ** 0.5
+        t0 = time.perf_counter()
+        _, trees = scene.place_trees(sim.rngs["trees"], p["trees"], radius, sim.ground, sim.sites)
+        out["trees_placed"] = len(trees)
+        out["place_s"] = time.perf_counter() - t0
+    return out
+
+def run_batch(tasks, ticks, out, workers=None, step=1/60, log=print):
+    # Results are written one line at a time as runs finish, so a long sweep can be
+    # watched with `tail -f` and survives being interrupted
+    t0 = time.perf_counter()
+    busy = 0.0
+    with open(out, "w") as f:
+        if workers == 1:
+            results = (run_scenario(t, ticks, step) for t in tasks)
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            futures = [pool.submit(run_scenario, t, ticks, step) for t in tasks]
+            results = (fut.result() for fut in as_completed(futures))
+        try:
+            for i, r in enumerate(results, 1):
+                f.write(json.dumps(r) + "\n")
+                f.flush()
+                busy += r["wall"] + r.get("place_s", 0.0)
+                log("[%d/%d] scenario %d#%d %.2fs %s" % (i, len(tasks), r["scenario"], r["repeat"], r["wall"],
+                                                        json.dumps(r["params"], sort_keys=True)))
+        finally:
+            if workers != 1:
+                pool.shutdown(cancel_futures=True)
+    wall = time.perf_counter() - t0
+    return {"runs": len(tasks), "wall": wall, "busy": busy, "parallelism": busy / wall if wall > 0 else 0.0}
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m campground.batch", description="Run headless scenario sweeps across processes")
+    ap.add_argument("--grid", metavar="PATH", help="JSON object mapping each parameter to its list of values")
+    ap.add_argument("--ticks", type=int, default=3600, help="fixed steps per run")
+    ap.add_argument("--step", type=float, default=1/60)
+    ap.add_argument("--repeats", type=int, default=1, help="runs per scenario, each with its own seed")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--workers", type=int, default=None, help="processes (default: one per core; 1 runs in-process)")
+    ap.add_argument("--out", default="results.jsonl", help="JSONL file to stream results to")
+    return ap.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    grid = default_grid
+    if args.grid:
+        with open(args.grid) as f:
+            grid = json.load(f)
+    tasks = scenarios(grid, args.repeats, args.seed)
+    summary = run_batch(tasks, args.ticks, args.out, args.workers, args.step)
+    print("%d runs in %.2fs, %.1f runs in parallel on average -> %s"
+          % (summary["runs"], summary["wall"], summary["parallelism"], args.out))
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,6 @@
 import math
 from pyglm import glm
-from pygame.locals import *
+from campground.keys import K_w, K_s, K_a, K_d, K_SPACE, K_LSHIFT
 
 class Camera:
     def __init__(self):
@@ -21,6 +21,12 @@ class Camera:
         right      = glm.cross(self.front, glm.vec3(0,1,0))
         self.up    = glm.normalize(glm.cross(right, self.front))
 
+    def look(self, position, yaw, pitch):
+        self.position   = glm.vec3(*position)
+        self.yaw        = yaw
+        self.pitch      = pitch
+        self._update_vectors()
+
     def process_keyboard(self, keys, dt):
         v = self.move_speed * dt
         if keys[K_w]:       self.position += self.front * v
@@ -40,10 +46,10 @@ class Camera:
     def zoom(self, amount):
         self.position += self.front * amount
 
-    def apply(self):
-        view = glm.lookAt(self.position, self.position + self.front, self.up)
-        data = [view[i][j] for i in range(4) for j in range(4)]
-        from OpenGL.GL import glMatrixMode, glLoadIdentity, glMultMatrixf, GL_MODELVIEW
-        glMatrixMode(GL_MODELVIEW)
-        glLoadIdentity()
-        glMultMatrixf(data)
+    def view_matrix(self):
+        return glm.lookAt(self.position, self.position + self.front, self.up)
+
+    def view_data(self):
+        # Column-major floats, as glLoadMatrixf takes them
+        view = self.view_matrix()
+        return [view[i][j] for i in range(4) for j in range(4)]
@@ -0,0 +1,113 @@
+import json
+import math
+import numpy as np
+from campground.spatial import poisson_disk
+
+# Where a site's fire pit sits in its tent's frame when the config doesn't place it
+fire_offset = (-1.2, -1.7)
+
+def beside(tent, yaw, offset=fire_offset):
+    # `offset` in the frame of a tent at `tent` turned `yaw` degrees, in world x, z
+    c, s = math.cos(math.radians(yaw)), math.sin(math.radians(yaw))
+    return (tent[0] + c * offset[0] + s * offset[1], tent[1] - s * offset[0] + c * offset[1])
+
+class Campsites:
+    # Every campsite as one row of flat arrays: a tent and the fire pit beside it
+    def __init__(self, tents, tent_yaw, tent_size, fires, fire_radius, lit):
+        self.tents       = np.asarray(tents, dtype=np.float64).reshape(-1, 2)
+        self.tent_yaw    = np.asarray(tent_yaw, dtype=np.float64).reshape(-1)
+        self.tent_size   = np.asarray(tent_size, dtype=np.float64).reshape(-1, 2)
+        self.fires       = np.asarray(fires, dtype=np.float64).reshape(-1, 2)
+        self.fire_radius = np.asarray(fire_radius, dtype=np.float64).reshape(-1)
+        self.lit         = np.asarray(lit, dtype=bool).reshape(-1)
+        self.tent_y      = np.zeros(len(self))
+        self.fire_y      = np.zeros(len(self))
+        self._mask       = None
+
+    def __len__(self):
+        return len(self.tents)
+
+    @classmethod
+    def from_dict(cls, cfg):
+        rows = [dict(s) for s in cfg.get("sites", [])]
+        gen = cfg.get("generate")
+        if gen:
+            rows += generate(**gen)
+        get = lambda k, d: [r.get(k, d) for r in rows]
+        tents, yaws = get("tent", (0.0, 0.0)), get("tent_yaw", 0.0)
+        fires = [r["fire"] if "fire" in r else beside(t, a) for r, t, a in zip(rows, tents, yaws)]
+        return cls(tents, yaws, get("tent_size", (1.0, 1.5)), fires, get("fire_radius", 0.5), get("lit", True))
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    def settle(self, ground):
+        # Sit tents and fires on the terrain
+        if ground is None: return
+        self.tent_y = ground.height_at(self.tents[:, 0], self.tents[:, 1])
+        self.fire_y = ground.height_at(self.fires[:, 0], self.fires[:, 1])
+
+    def fire_points(self, lift=0.0, lit_only=True):
+        sel = self.lit if lit_only else slice(None)
+        return np.column_stack([self.fires[sel, 0], self.fire_y[sel] + lift, self.fires[sel, 1]])
+
+    def nearest_fires(self, eye, n):
+        # Indices of the n closest lit fires, nearest first
+        lit = np.flatnonzero(self.lit)
+        if len(lit) == 0 or n <= 0: return lit[:0]
+        d = np.hypot(self.fires[lit, 0] - eye[0], self.fires[lit, 1] - eye[2])
+        if len(lit) > n:
+            part = np.argpartition(d, n - 1)[:n]
+            lit, d = lit[part], d[part]
+        return lit[np.argsort(d, kind="stable")]
+
+    def blocker(self, tent_buffer=1.0, pit_buffer=0.5, res=0.25):
+        # Vectorized reject(x, z) for tree placement, backed by a raster of the footprints
+        if len(self) == 0:
+            return lambda x, z: np.zeros(np.shape(x), dtype=bool)
+        tr = self.tent_size[:, 0] * math.sqrt(2.0) + tent_buffer
+        fr = self.fire_radius + pit_buffer
+        lo = np.minimum((self.tents - tr[:, None]).min(axis=0), (self.fires - fr[:, None]).min(axis=0))
+        hi = np.maximum((self.tents + tr[:, None]).max(axis=0), (self.fires + fr[:, None]).max(axis=0))
+        shape = np.ceil((hi - lo) / res).astype(int) + 1
+        mask = np.zeros(shape, dtype=bool)
+        c, s = np.cos(np.radians(self.tent_yaw)), np.sin(np.radians(self.tent_yaw))
+        for i in range(len(self)):
+            x, z, ix, iz = _window(self.tents[i], tr[i], lo, res, shape)
+            # Square footprint in the tent's own frame
+            u, v = c[i] * x - s[i] * z, s[i] * x + c[i] * z
+            b = self.tent_size[i, 0] + tent_buffer
+            mask[ix, iz] |= (np.abs(u) < b) & (np.abs(v) < b)
+            x, z, ix, iz = _window(self.fires[i], fr[i], lo, res, shape)
+            mask[ix, iz] |= x * x + z * z < fr[i] * fr[i]
+
+        def reject(x, z):
+            ix = np.floor((np.asarray(x) - lo[0]) / res).astype(np.int64)
+            iz = np.floor((np.asarray(z) - lo[1]) / res).astype(np.int64)
+            inside = (ix >= 0) & (iz >= 0) & (ix < shape[0]) & (iz < shape[1])
+            out = np.zeros(ix.shape, dtype=bool)
+            out[inside] = mask[ix[inside], iz[inside]]
+            return out
+        return reject
+
+def _window(centre, r, lo, res, shape):
+    # Raster cells covering a square of half-size r, with cell-centre offsets from `centre`
+    i0 = np.maximum(np.floor((centre - r - lo) / res).astype(int), 0)
+    i1 = np.minimum(np.ceil((centre + r - lo) / res).astype(int) + 1, shape)
+    ix, iz = np.meshgrid(np.arange(i0[0], i1[0]), np.arange(i0[1], i1[1]), indexing="ij")
+    x = lo[0] + (ix + 0.5) * res - centre[0]
+    z = lo[1] + (iz + 0.5) * res - centre[1]
+    return x, z, ix, iz
+
+def generate(count, radius, spacing=12.0, seed=0, lit=0.8, fire=fire_offset, keep_clear=10.0):
+    # `count` sites spread by Poisson-disk sampling, each with a random heading; the fire sits
+    # at `fire` in the tent's frame. Nothing lands within `keep_clear` of the origin.
+    rng = np.random.default_rng(seed)
+    pts = poisson_disk(-radius, -radius, radius, radius, spacing, count=count, rng=rng,
+                       reject=lambda x, z: np.hypot(x, z) < keep_clear)
+    yaw = rng.uniform(0, 360, len(pts))
+    on = rng.random(len(pts)) < lit
+    return [{"tent": (x, z), "tent_yaw": a, "fire": beside((x, z), a, fire), "lit": bool(l)}
+            for (x, z), a, l in zip(pts.tolist(), yaw.tolist(), on.tolist())]
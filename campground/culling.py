@@ -0,0 +1,62 @@
+import numpy as np
+
+def frustum_planes(view_proj):
+    # Gribb/Hartmann: rows of the (row-major) clip matrix give the six planes, inside is >= 0
+    m = np.array(view_proj.to_list(), dtype=np.float64).T if hasattr(view_proj, "to_list") \
+        else np.asarray(view_proj, dtype=np.float64)
+    planes = np.array([m[3] + m[0], m[3] - m[0],
+                       m[3] + m[1], m[3] - m[1],
+                       m[3] + m[2], m[3] - m[2]])
+    return planes / np.linalg.norm(planes[:, :3], axis=1, keepdims=True)
+
+def spheres_visible(planes, centers, radii):
+    centers = np.asarray(centers, dtype=np.float64).reshape(-1, 3)
+    dist = centers @ planes[:, :3].T + planes[:, 3]
+    return np.all(dist >= -np.asarray(radii, dtype=np.float64).reshape(-1, 1), axis=1)
+
+class LodPicker:
+    def __init__(self, distances=(20.0, 45.0)):
+        self.distances = np.asarray(distances, dtype=np.float64)
+
+    @property
+    def levels(self):
+        return len(self.distances) + 1
+
+    def pick(self, centers, eye):
+        d = np.linalg.norm(np.asarray(centers, dtype=np.float64).reshape(-1, 3) - eye, axis=1)
+        return np.searchsorted(self.distances, d)
+
+class Culler:
+    def __init__(self, lod=None):
+        self.lod    = lod or LodPicker()
+        self.planes = np.zeros((0, 4))
+        self.eye    = np.zeros(3)
+        self.stats  = {}
+
+    def begin_frame(self, view_proj, eye):
+        self.planes = frustum_planes(view_proj)
+        self.eye    = np.array(eye, dtype=np.float64)
+        self.stats  = {}
+
+    def _count(self, name, total, visible):
+        st = self.stats.setdefault(name, {"visible": 0, "culled": 0})
+        st["visible"] += visible
+        st["culled"]  += total - visible
+        return st
+
+    def visible(self, name, center, radius):
+        ok = bool(spheres_visible(self.planes, center, radius)[0])
+        self._count(name, 1, int(ok))
+        return ok
+
+    def cull(self, name, ids, centers, radii, total=None, lod=None):
+        # Returns the visible ids split by LOD level, nearest level first
+        lod = lod or self.lod
+        ids = np.asarray(ids)
+        keep = spheres_visible(self.planes, centers, radii)
+        ids, centers = ids[keep], np.asarray(centers).reshape(-1, 3)[keep]
+        level = lod.pick(centers, self.eye)
+        by_level = [ids[level == k] for k in range(lod.levels)]
+        st = self._count(name, len(keep) if total is None else total, len(ids))
+        st["lod"] = [len(b) for b in by_level]
+        return by_level
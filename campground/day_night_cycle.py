@@ -0,0 +1,31 @@
+import math
+from campground.sky import sky_table, lookup
+
+class DayNightCycle:
+    # With `length` seconds per day the time advances continuously; with 0 it holds at noon
+    # or midnight. Lighting comes from a table sampled once, so a frame costs one lookup.
+    def __init__(self, length=0.0, time=0.25, samples=256):
+        self.length   = length
+        self.sun_size = 5.0
+        self.table    = sky_table(samples)
+        self.set_time(time)
+
+    @property
+    def elevation(self):
+        return math.sin(self.time * 2 * math.pi)
+
+    def set_time(self, time):
+        self.time     = time % 1.0
+        self.state    = lookup(self.table, self.time)
+        self.sun_pos  = self.state["sun"]
+        self.moon_pos = self.state["moon"]
+        self.mode     = "day" if self.elevation >= 0 else "night"
+
+    def update(self, dt, mode):
+        # Returns whether it is day. Flipping `mode` (the day/night keys) jumps to noon or
+        # midnight; otherwise a continuous cycle just moves on.
+        if mode != self.mode:
+            self.set_time(0.25 if mode == "day" else 0.75)
+        elif self.length > 0:
+            self.set_time(self.time + dt / self.length)
+        return self.mode == "day"
@@ -0,0 +1,210 @@
+import math
+import threading
+import numpy as np
+
+def _hash(ix, iz, seed):
+    # Integer lattice hash to [0, 1); uint32 arithmetic wraps, which is the point
+    with np.errstate(over="ignore"):
+        h = (ix.astype(np.uint32) * np.uint32(0x8DA6B343)) ^ (iz.astype(np.uint32) * np.uint32(0xD8163841))
+        h ^= np.uint32(seed & 0xFFFFFFFF)
+        h ^= h >> np.uint32(13)
+        h *= np.uint32(0x5BD1E995)
+        h ^= h >> np.uint32(15)
+    return h * (1.0 / 2**32)
+
+def value_noise(x, z, seed=0):
+    x0, z0 = np.floor(x), np.floor(z)
+    fx, fz = x - x0, z - z0
+    ux, uz = fx * fx * (3 - 2 * fx), fz * fz * (3 - 2 * fz)
+    ix, iz = x0.astype(np.int64), z0.astype(np.int64)
+    a, b = _hash(ix, iz, seed), _hash(ix + 1, iz, seed)
+    c, d = _hash(ix, iz + 1, seed), _hash(ix + 1, iz + 1, seed)
+    top, bottom = a + (b - a) * ux, c + (d - c) * ux
+    return top + (bottom - top) * uz
+
+def fbm(x, z, seed=0, octaves=5, lacunarity=2.0, gain=0.5):
+    # Sum of octaves scaled to [-1, 1]
+    x, z = np.asarray(x, dtype=np.float64), np.asarray(z, dtype=np.float64)
+    total, amp, freq, norm = np.zeros(np.broadcast(x, z).shape), 1.0, 1.0, 0.0
+    for i in range(octaves):
+        total += amp * value_noise(x * freq, z * freq, seed + 7919 * i)
+        norm  += amp
+        amp   *= gain
+        freq  *= lacunarity
+    return total * (2.0 / norm) - 1.0
+
+class Heightmap:
+    # Procedural ground sampled on a lattice of `cell` units. Within `flat` of the origin the
+    # campsite stays level at `base`, blending into the hills over the next `blend` units.
+    # Lattice heights are cached in square blocks of `block` cells for height_at; terrain chunk
+    # grids that line up with a block fill it for free.
+    def __init__(self, seed=0, amplitude=10.0, scale=70.0, octaves=5, cell=1.0,
+                 base=0.0, flat=8.0, blend=14.0, block=32, max_blocks=1024):
+        self.seed      = int(seed)
+        self.amplitude = amplitude
+        self.scale     = scale
+        self.octaves   = octaves
+        self.cell      = cell
+        self.base      = base
+        self.flat      = flat
+        self.blend     = blend
+        # Pre-sampled chunk grids keyed by (chunk key, size, res), e.g. from a scene snapshot
+        self.tiles     = {}
+        self.block     = block
+        self.max_blocks = max_blocks
+        self.blocks    = {}
+        # Chunk grids arrive from loader threads while the main thread looks heights up
+        self._lock     = threading.Lock()
+
+    def sample(self, x, z):
+        x, z = np.asarray(x, dtype=np.float64), np.asarray(z, dtype=np.float64)
+        h = self.amplitude * fbm(x / self.scale, z / self.scale, self.seed, self.octaves)
+        t = np.clip((np.hypot(x, z) - self.flat) / self.blend, 0.0, 1.0)
+        return self.base + h * (t * t * (3 - 2 * t))
+
+    def grid(self, x0, z0, n, step):
+        # (n+1, n+1) samples starting at (x0, z0); rows run along z
+        xs = x0 + step * np.arange(n + 1)
+        zs = z0 + step * np.arange(n + 1)
+        return self.sample(xs[None, :], zs[:, None])
+
+    def chunk_grid(self, key, size, res):
+        # Samples for chunk_mesh: the chunk plus a one-cell ring, so (res+3, res+3)
+        tile = self.tiles.get((tuple(key), size, res))
+        cell = size / res
+        if tile is None:
+            tile = self.grid(key[0] * size - cell, key[1] * size - cell, res + 2, cell)
+        if res == self.block and cell == self.cell:
+            self._keep((int(key[0]), int(key[1])), tile[1:-1, 1:-1])
+        return tile
+
+    def _keep(self, key, h):
+        with self._lock:
+            self.blocks[key] = h
+            # Oldest first, so a long walk doesn't hold every block it passed
+            while len(self.blocks) > self.max_blocks:
+                del self.blocks[next(iter(self.blocks))]
+
+    def lattice(self, bx, bz):
+        # (block+1, block+1) lattice heights of block (bx, bz), rows along z
+        h = self.blocks.get((bx, bz))
+        if h is None:
+            n, c = self.block, self.cell
+            h = self.grid(bx * n * c, bz * n * c, n, c)
+            self._keep((bx, bz), h)
+        return h
+
+    def height_at(self, x, z):
+        # Bilinear between the four lattice samples around (x, z): the same surface the
+        # full-detail terrain mesh draws, so anything placed with it sits on the ground.
+        # Done in slices so a big batch doesn't hold every temporary at once.
+        x, z = np.asarray(x, dtype=np.float64), np.asarray(z, dtype=np.float64)
+        x, z = np.broadcast_arrays(x / self.cell, z / self.cell)
+        shape, x, z = x.shape, x.ravel(), z.ravel()
+        out = np.empty(len(x))
+        for s in range(0, len(x), 16384):
+            out[s:s + 16384] = self._lookup(x[s:s + 16384], z[s:s + 16384])
+        return out.reshape(shape)
+
+    def _lookup(self, x, z):
+        # x, z in cells. Corners come from cached blocks; a block is sampled whole once it holds
+        # enough of the points to cost no more than their corners would, the rest sample directly.
+        x0, z0 = np.floor(x), np.floor(z)
+        fx, fz = x - x0, z - z0
+        ix, iz = x0.astype(np.int64), z0.astype(np.int64)
+        n, m = self.block, self.block + 1
+        bx, bz = ix // n, iz // n
+        codes, inv, counts = np.unique((bx << 32) | (bz & 0xFFFFFFFF), return_inverse=True, return_counts=True)
+        keys = zip((codes >> 32).tolist(), (((codes & 0xFFFFFFFF) ^ 0x80000000) - 0x80000000).tolist())
+        blocks, slot = [], np.full(len(codes), -1)
+        for k, key in enumerate(keys):
+            h = self.blocks.get(key)
+            if h is None and 4 * counts[k] >= m * m:
+                h = self.lattice(*key)
+            if h is not None:
+                slot[k] = len(blocks)
+                blocks.append(h)
+        out = np.empty(len(x))
+        at = slot[inv.ravel()]
+        on, off = np.flatnonzero(at >= 0), np.flatnonzero(at < 0)
+        if len(on):
+            flat = np.concatenate([h.ravel() for h in blocks])
+            i = at[on] * (m * m) + (iz[on] - bz[on] * n) * m + ix[on] - bx[on] * n
+            a, b, d, e = flat[i], flat[i + 1], flat[i + m], flat[i + m + 1]
+            tx, tz = fx[on], fz[on]
+            out[on] = (a + (b - a) * tx) * (1 - tz) + (d + (e - d) * tx) * tz
+        if len(off):
+            c = self.cell
+            px, pz, tx, tz = x0[off] * c, z0[off] * c, fx[off], fz[off]
+            a, b = self.sample(px, pz), self.sample(px + c, pz)
+            d, e = self.sample(px, pz + c), self.sample(px + c, pz + c)
+            out[off] = (a + (b - a) * tx) * (1 - tz) + (d + (e - d) * tx) * tz
+        return out
+
+class HeightPatch:
+    # Lattice heights under a square following a moving point, so many lookups near it cost a
+    # bilinear blend of cached samples rather than fbm. Re-sampled only once the square drifts
+    # `margin` units past the last sampling.
+    def __init__(self, heightmap, half, margin=8.0):
+        self.heightmap = heightmap
+        self.half   = half
+        self.margin = margin
+        self.x0     = self.z0 = 0.0
+        self.n      = 0
+        self.h      = None
+        # Highest sample on the patch: nothing above it can be under the ground
+        self.top    = 0.0
+
+    def follow(self, x, z):
+        c, span = self.heightmap.cell, self.n * self.heightmap.cell
+        if self.h is not None and self.x0 <= x - self.half and x + self.half <= self.x0 + span \
+                and self.z0 <= z - self.half and z + self.half <= self.z0 + span:
+            return
+        r = self.half + self.margin
+        self.x0 = math.floor((x - r) / c) * c
+        self.z0 = math.floor((z - r) / c) * c
+        self.n  = int(math.ceil(2 * r / c)) + 1
+        self.h  = self.heightmap.grid(self.x0, self.z0, self.n, c)
+        self.top = float(self.h.max())
+
+    def height_at(self, x, z):
+        # Same surface as Heightmap.height_at; points off the patch clamp to its edge. Rain calls
+        # this every tick, where per-call overhead outweighs the arithmetic: x and z go through
+        # as two rows and the four corners come out of one take.
+        c, n = self.heightmap.cell, self.n
+        f = np.array((x, z), dtype=np.float64).reshape(2, -1)
+        f -= ((self.x0,), (self.z0,))
+        f /= c
+        np.minimum(np.maximum(f, 0.0, out=f), n, out=f)
+        i = np.minimum(f.astype(np.intp), n - 1)
+        f -= i
+        q = self.h.take(i[1] * (n + 1) + i[0] + ((0,), (n + 1,), (1,), (n + 2,)))
+        top, bottom = q[:2] + (q[2:] - q[:2]) * f[0]
+        return (top * (1 - f[1]) + bottom * f[1]).reshape(np.shape(x))
+
+def chunk_mesh(heightmap, key, size, res):
+    # Vertices, normals and bounds of the square terrain chunk `key`, `res` cells across,
+    # followed by a skirt hanging from its rim
+    n, cell = res, size / res
+    x0, z0 = key[0] * size, key[1] * size
+    # One extra ring of samples so edge normals match the neighbouring chunk
+    h = heightmap.chunk_grid(key, size, res)
+    y = h[1:-1, 1:-1]
+    xs = x0 + cell * np.arange(n + 1)
+    zs = z0 + cell * np.arange(n + 1)
+    verts = np.empty((n + 1, n + 1, 3), dtype=np.float32)
+    verts[..., 0], verts[..., 1], verts[..., 2] = xs[None, :], y, zs[:, None]
+    norms = np.empty_like(verts)
+    norms[..., 0] = h[1:-1, :-2] - h[1:-1, 2:]
+    norms[..., 1] = 2 * cell
+    norms[..., 2] = h[:-2, 1:-1] - h[2:, 1:-1]
+    norms /= np.linalg.norm(norms, axis=-1, keepdims=True)
+    verts, norms = verts.reshape(-1, 3), norms.reshape(-1, 3)
+    edge = np.arange(n + 1)
+    rim = np.concatenate([edge, n * (n + 1) + edge, edge * (n + 1), edge * (n + 1) + n])
+    skirt = verts[rim].copy()
+    skirt[:, 1] -= max(1.0, 0.1 * size)
+    verts = np.concatenate([verts, skirt])
+    norms = np.concatenate([norms, norms[rim]])
+    lo, hi = verts.min(axis=0), verts.max(axis=0)
+    return verts, norms, (lo + hi) / 2, float(np.linalg.norm(hi - lo)) / 2
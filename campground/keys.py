@@ -0,0 +1,14 @@
+# The SDL2 keycodes pygame reports, so input can be handled (and replayed) without pygame
+K_ESCAPE = 27
+K_SPACE  = 32
+K_a      = ord("a")
+K_b      = ord("b")
+K_d      = ord("d")
+K_f      = ord("f")
+K_l      = ord("l")
+K_n      = ord("n")
+K_r      = ord("r")
+K_s      = ord("s")
+K_w      = ord("w")
+K_F3     = 0x4000003C
+K_LSHIFT = 0x400000E1
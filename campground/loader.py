@@ -0,0 +1,86 @@
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+class SceneLoader:
+    # Builds scene data (NumPy arrays, meshes, placements) on worker threads and hands each
+    # result back to the caller's thread, where pump() runs its upload within a per-frame time
+    # budget. Nothing here touches GL: uploads are whatever callbacks the renderer submits.
+    def __init__(self, workers=2, budget=0.004):
+        self.pool    = ThreadPoolExecutor(workers, thread_name_prefix="loader")
+        self.budget  = budget
+        self.ready   = deque()
+        self.jobs    = 0
+        self.done    = 0
+        self.stages  = {}
+        self.t0      = time.perf_counter()
+        self.t_done  = None
+
+    def submit(self, stage, build, upload, *args):
+        # build(*args) runs on a worker; upload(result) runs later on the thread calling pump()
+        self.jobs += 1
+        st = self.stages.setdefault(stage, {"jobs": 0, "build": 0.0, "upload": 0.0, "first": None, "last": None})
+        st["jobs"] += 1
+        fut = self.pool.submit(self._build, build, args)
+        fut.add_done_callback(lambda f: self.ready.append((stage, upload, f)))
+
+    @staticmethod
+    def _build(build, args):
+        t = time.perf_counter()
+        return build(*args), time.perf_counter() - t
+
+    def pump(self, budget=None):
+        # Run finished uploads until this call's budget (seconds) is spent. At least one runs
+        # per call, so loading always makes progress however slow a single upload is.
+        budget = self.budget if budget is None else budget
+        start = time.perf_counter()
+        n = 0
+        while self.ready:
+            if n and time.perf_counter() - start >= budget:
+                break
+            stage, upload, fut = self.ready.popleft()
+            result, build_s = fut.result()
+            t = time.perf_counter()
+            upload(result)
+            now = time.perf_counter()
+            st = self.stages[stage]
+            st["build"]  += build_s
+            st["upload"] += now - t
+            st["first"]   = now - self.t0 if st["first"] is None else st["first"]
+            st["last"]    = now - self.t0
+            self.done += 1
+            n += 1
+        # Time to the first moment nothing was left to load; later streaming doesn't move it
+        if not self.loading and self.t_done is None:
+            self.t_done = time.perf_counter() - self.t0
+        return n
+
+    @property
+    def loading(self):
+        return self.done < self.jobs
+
+    def progress(self):
+        return self.done / self.jobs if self.jobs else 1.0
+
+    def finish(self):
+        # Block until every job, including ones submitted by uploads, has been uploaded
+        while self.loading:
+            if not self.ready:
+                time.sleep(0.0005)
+            self.pump(float("inf"))
+
+    def report(self):
+        # One row per stage: jobs, total worker and upload time, and when the stage's first
+        # and last uploads landed relative to the loader starting
+        rows = ["%-14s %5s %9s %9s %9s %9s" % ("stage", "jobs", "build ms", "upload ms", "first ms", "last ms")]
+        for name, st in self.stages.items():
+            first = -1.0 if st["first"] is None else st["first"] * 1000.0
+            last = -1.0 if st["last"] is None else st["last"] * 1000.0
+            rows.append("%-14s %5d %9.1f %9.1f %9.1f %9.1f" % (name, st["jobs"], st["build"] * 1000.0,
+                                                            st["upload"] * 1000.0, first, last))
+        if self.t_done is not None:
+            rows.append("loaded in %.1f ms" % (self.t_done * 1000.0))
+        return rows
+
+    def shutdown(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,120 @@
+from functools import lru_cache
+import numpy as np
+
+def freeze(rules):
+    return tuple(sorted(rules.items()))
+
+@lru_cache(maxsize=64)
+def _expand(axiom, rules, iterations):
+    # Each rule is one C-level str.replace per iteration. With several rules the symbols are
+    # first swapped for private-use placeholders so one rule's output isn't rewritten by the next.
+    marks = [chr(0xE000 + i) for i in range(len(rules))] if len(rules) > 1 else None
+    res = axiom
+    for _ in range(iterations):
+        if marks is None:
+            for c, rhs in rules:
+                res = res.replace(c, rhs)
+            continue
+        for (c, _), m in zip(rules, marks):
+            res = res.replace(c, m)
+        for (_, rhs), m in zip(rules, marks):
+            res = res.replace(m, rhs)
+    return res
+
+def expand(axiom, rules, iterations):
+    return _expand(axiom, freeze(rules), iterations)
+
+def iter_symbols(axiom, rules, iterations):
+    # Depth-first rewrite: memory is one iterator per level, never the whole string
+    stack = [(iter(axiom), iterations)]
+    while stack:
+        it, depth = stack[-1]
+        for c in it:
+            if depth and c in rules:
+                stack.append((iter(rules[c]), depth - 1))
+                break
+            yield c
+        else:
+            stack.pop()
+
+def symbol_counts(axiom, rules, iterations):
+    # counts_n = counts_0 @ M^n where M[i, j] is how many j's one i rewrites into
+    alphabet = sorted(set(axiom).union(rules, *rules.values()))
+    pos = {c: i for i, c in enumerate(alphabet)}
+    m = np.eye(len(alphabet), dtype=object)
+    for c, rhs in rules.items():
+        m[pos[c]] = 0
+        for d in rhs:
+            m[pos[c], pos[d]] += 1
+    v = np.zeros(len(alphabet), dtype=object)
+    for c in axiom:
+        v[pos[c]] += 1
+    v = v.dot(np.linalg.matrix_power(m, iterations)) if iterations else v
+    return {c: int(n) for c, n in zip(alphabet, v) if n}
+
+class LSystem:
+    def __init__(self, axiom, rules, iterations):
+        self.axiom      = axiom
+        self.rules      = rules
+        self.iterations = iterations
+
+    def generate(self):
+        return expand(self.axiom, self.rules, self.iterations)
+
+    def __iter__(self):
+        return iter_symbols(self.axiom, self.rules, self.iterations)
+
+    def counts(self):
+        return symbol_counts(self.axiom, self.rules, self.iterations)
+
+    def __len__(self):
+        return sum(self.counts().values())
+
+def interpret(symbols, angle=25.0, roll=137.5, max_segments=None):
+    # 3D turtle: F draws, +/- turn about the up axis, [ ] push/pop. Each push also rolls the
+    # frame about the heading so sibling branches fan out instead of sharing one plane.
+    # Runs of F with no turn between them come out as one segment.
+    # Returns start points, end points and branch depth per segment, plus which segments end a branch.
+    # max_segments sizes the arrays up front (symbols may be an iterator); the turtle stops once
+    # that many segments are out.
+    n = max_segments if max_segments is not None else symbols.count("F")
+    starts = np.empty((n, 3))
+    ends   = np.empty((n, 3))
+    depth  = np.empty(n, dtype=np.int32)
+    tips   = np.zeros(n, dtype=bool)
+    ca, sa = np.cos(np.radians(angle)), np.sin(np.radians(angle))
+    cr, sr = np.cos(np.radians(roll)), np.sin(np.radians(roll))
+    p, h, l, u = (0.0, 0.0, 0.0), (0.0, 1.0, 0.0), (1.0, 0.0, 0.0), (0.0, 0.0, 1.0)
+    stack, k, d, run = [], 0, 0, None
+    for c in symbols:
+        if c == "F":
+            if run is None:
+                run = p
+            p = (p[0] + h[0], p[1] + h[1], p[2] + h[2])
+            continue
+        if run is not None:
+            if k == n:
+                break
+            starts[k], ends[k], depth[k] = run, p, d
+            k += 1
+            run = None
+        if c == "+" or c == "-":
+            s = sa if c == "+" else -sa
+            h, l = (tuple(ca * a + s * b for a, b in zip(h, l)),
+                    tuple(ca * b - s * a for a, b in zip(h, l)))
+        elif c == "[":
+            stack.append((p, h, l, u, d))
+            l, u = (tuple(cr * a + sr * b for a, b in zip(l, u)),
+                    tuple(cr * b - sr * a for a, b in zip(l, u)))
+            d += 1
+        elif c == "]":
+            if k and not tips[k - 1] and depth[k - 1] == d:
+                tips[k - 1] = True
+            p, h, l, u, d = stack.pop()
+    if run is not None and k < n:
+        starts[k], ends[k], depth[k] = run, p, d
+        k += 1
+    if k:
+        tips[k - 1] = True
+    return starts[:k], ends[:k], depth[:k], tips[:k]
+
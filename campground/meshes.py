@@ -0,0 +1,179 @@
+from functools import lru_cache
+import numpy as np
+from campground.lsystem import expand, freeze, interpret
+
+class Mesh:
+    def __init__(self, verts, normals, indices, colors=None):
+        self.verts   = np.asarray(verts, dtype=np.float32)
+        self.normals = np.asarray(normals, dtype=np.float32)
+        self.indices = np.asarray(indices, dtype=np.uint32)
+        if colors is None:
+            colors = np.full((len(self.verts), 4), 255, dtype=np.uint8)
+        self.colors  = np.asarray(colors, dtype=np.uint8)
+
+    def __len__(self):
+        return len(self.verts)
+
+    def colored(self, rgb):
+        c = np.empty((len(self.verts), 4), dtype=np.uint8)
+        c[:, :3] = np.round(np.asarray(rgb) * 255)
+        c[:, 3]  = 255
+        return Mesh(self.verts, self.normals, self.indices, c)
+
+def merge(*meshes):
+    offs = np.cumsum([0] + [len(m) for m in meshes[:-1]])
+    return Mesh(np.concatenate([m.verts for m in meshes]),
+                np.concatenate([m.normals for m in meshes]),
+                np.concatenate([m.indices + o for m, o in zip(meshes, offs)]),
+                np.concatenate([m.colors for m in meshes]))
+
+def _grid_indices(rows, cols):
+    # Two triangles per cell of a (rows+1) x (cols+1) vertex grid
+    i = (np.arange(rows)[:, None] * (cols + 1) + np.arange(cols)[None, :]).ravel()
+    j = i + cols + 1
+    return np.stack([i, j, i + 1, i + 1, j, j + 1], axis=-1).ravel()
+
+def frustum(base, top, height, slices, stacks, y0=0.0):
+    # Open truncated cone along +y, same shape as gluCylinder after a -90 deg X rotation
+    a  = np.linspace(0.0, 2 * np.pi, slices + 1)
+    t  = np.linspace(0.0, 1.0, stacks + 1)
+    r  = base + (top - base) * t
+    ca, sa = np.cos(a), np.sin(a)
+    v = np.empty((stacks + 1, slices + 1, 3))
+    v[..., 0] = r[:, None] * ca
+    v[..., 1] = (y0 + height * t)[:, None]
+    v[..., 2] = r[:, None] * sa
+    n = np.stack([ca, np.full_like(a, (base - top) / height), sa], axis=-1)
+    n /= np.linalg.norm(n, axis=-1, keepdims=True)
+    n = np.broadcast_to(n, v.shape)
+    return Mesh(v.reshape(-1, 3), n.reshape(-1, 3), _grid_indices(stacks, slices))
+
+def cone(base, height, slices, stacks, y0=0.0):
+    return frustum(base, 0.0, height, slices, stacks, y0)
+
+def cylinder(slices, stacks):
+    return frustum(1.0, 1.0, 1.0, slices, stacks)
+
+def sphere(slices, stacks):
+    # Unit sphere, poles on the y axis
+    a = np.linspace(0.0, 2 * np.pi, slices + 1)
+    p = np.linspace(0.0, np.pi, stacks + 1)
+    v = np.empty((stacks + 1, slices + 1, 3))
+    v[..., 0] = np.sin(p)[:, None] * np.cos(a)
+    v[..., 1] = np.cos(p)[:, None]
+    v[..., 2] = np.sin(p)[:, None] * np.sin(a)
+    v = v.reshape(-1, 3)
+    return Mesh(v, v, _grid_indices(stacks, slices))
+
+def pyramid(sides=4):
+    # Unit half-width base on y=0, apex at y=1, one flat-shaded triangle per side
+    a = np.pi / sides + np.linspace(0.0, 2 * np.pi, sides + 1)
+    r = np.sqrt(2.0) if sides == 4 else 1.0
+    rim = np.stack([r * np.cos(a), np.zeros_like(a), r * np.sin(a)], axis=-1)
+    apex = np.array([0.0, 1.0, 0.0])
+    v = np.stack([np.broadcast_to(apex, rim[:-1].shape), rim[1:], rim[:-1]], axis=1)
+    n = np.cross(v[:, 1] - v[:, 0], v[:, 2] - v[:, 0])
+    n /= np.linalg.norm(n, axis=1, keepdims=True)
+    return Mesh(v.reshape(-1, 3), np.repeat(n, 3, axis=0), np.arange(3 * sides))
+
+def tree_mesh(trunk_slices=8, foliage_slices=10, stacks=1):
+    trunk   = frustum(0.1, 0.08, 1.0, trunk_slices, stacks).colored((0.6, 0.3, 0.1))
+    foliage = cone(0.5, 1.5, foliage_slices, stacks, y0=0.7).colored((0.1, 0.6, 0.1))
+    return merge(trunk, foliage)
+
+def _card(axis, pts, rgb):
+    # Flat polygon in the plane spanned by `axis` and +y
+    pts = np.asarray(pts, dtype=np.float64)
+    v = np.zeros((len(pts), 3))
+    v[:, axis], v[:, 1] = pts[:, 0], pts[:, 1]
+    # Tilt the normal like the cone sides so cards shade close to the full mesh
+    n = np.zeros((len(pts), 3))
+    n[:, 2 - axis], n[:, 1] = 0.949, 0.316
+    idx = [i for k in range(1, len(pts) - 1) for i in (0, k, k + 1)]
+    return Mesh(v, n, idx).colored(rgb)
+
+def tree_billboard():
+    # Two crossed vertical cards, each with a trunk quad and a foliage triangle
+    cards = []
+    for axis in (0, 2):
+        cards.append(_card(axis, [(-0.1, 0.0), (0.1, 0.0), (0.1, 1.0), (-0.1, 1.0)], (0.6, 0.3, 0.1)))
+        cards.append(_card(axis, [(-0.5, 0.7), (0.5, 0.7), (0.0, 2.2)], (0.1, 0.6, 0.1)))
+    return merge(*cards)
+
+def branch_mesh(starts, ends, r0, r1, slices):
+    # One open frustum per segment, built for all segments at once
+    axis = ends - starts
+    axis /= np.linalg.norm(axis, axis=1, keepdims=True)
+    ref = np.where(np.abs(axis[:, 1:2]) < 0.9, (0.0, 1.0, 0.0), (1.0, 0.0, 0.0))
+    u = np.cross(axis, ref)
+    u /= np.linalg.norm(u, axis=1, keepdims=True)
+    w = np.cross(axis, u)
+    a = np.linspace(0.0, 2 * np.pi, slices + 1)
+    ring = np.cos(a)[None, :, None] * u[:, None] + np.sin(a)[None, :, None] * w[:, None]
+    v = np.stack([starts[:, None] + ring * r0[:, None, None], ends[:, None] + ring * r1[:, None, None]], axis=1)
+    n = np.broadcast_to(ring[:, None], v.shape)
+    per = 2 * (slices + 1)
+    idx = _grid_indices(1, slices)[None, :] + (np.arange(len(starts)) * per)[:, None]
+    return Mesh(v.reshape(-1, 3), n.reshape(-1, 3), idx.ravel())
+
+# Leaf clusters: an octahedron, or a tetrahedron at half the triangles for distant trees
+_octa = np.array([(1,0,0), (-1,0,0), (0,1,0), (0,-1,0), (0,0,1), (0,0,-1)], dtype=np.float64)
+_octa_idx = np.array([0,2,4, 4,2,1, 1,2,5, 5,2,0, 4,3,0, 1,3,4, 5,3,1, 0,3,5])
+_tetra = np.array([(1,1,1), (1,-1,-1), (-1,1,-1), (-1,-1,1)], dtype=np.float64) / np.sqrt(3.0)
+_tetra_idx = np.array([0,1,2, 0,3,1, 0,2,3, 1,3,2])
+leaf_shapes = {"octa": (_octa, _octa_idx), "tetra": (_tetra, _tetra_idx)}
+
+def leaf_mesh(points, size, shape="octa"):
+    corners, tris = leaf_shapes[shape]
+    v = points[:, None] + corners[None] * size
+    idx = tris[None, :] + (np.arange(len(points)) * len(corners))[:, None]
+    return Mesh(v.reshape(-1, 3), np.broadcast_to(corners, v.shape).reshape(-1, 3), idx.ravel())
+
+@lru_cache(maxsize=64)
+def _lsystem_tree(axiom, rules, iterations, slices, angle, max_depth, leaves):
+    symbols = expand(axiom, dict(rules), iterations)
+    starts, ends, depth, tips = interpret(symbols, angle)
+    if len(starts) == 0:
+        return tree_mesh()
+    # Same frame as the cone tree: base at the origin, 2.2 units tall
+    k = 2.2 / max(ends[:, 1].max(), 1e-6)
+    starts, ends = starts * k, ends * k
+    crown = leaf_mesh(ends[tips], 0.35 * k ** 0.5, leaves).colored((0.1, 0.6, 0.1))
+    # Twigs past max_depth are dropped; their leaves stay, so the crown keeps its outline
+    keep = depth <= max_depth
+    starts, ends, depth = starts[keep], ends[keep], depth[keep]
+    r0 = 0.1 * 0.6 ** depth
+    wood = branch_mesh(starts, ends, r0, 0.8 * r0, slices).colored((0.6, 0.3, 0.1))
+    return merge(wood, crown)
+
+def lsystem_tree(lsys, slices=5, angle=25.0, max_depth=None, leaves="octa"):
+    # Cached per grammar, so a forest of identical L-systems shares one mesh
+    max_depth = lsys.iterations if max_depth is None else max_depth
+    return _lsystem_tree(lsys.axiom, freeze(lsys.rules), lsys.iterations, slices, angle, max_depth, leaves)
+
+def fit_lsystem_tree(lsys, budget, slices=3, leaves="octa"):
+    # The most iterations, then the deepest twigs, that stay within `budget` vertices; None if
+    # even a single iteration's trunk and leaves are over it
+    for n in range(lsys.iterations, 0, -1):
+        grammar = type(lsys)(lsys.axiom, lsys.rules, n)
+        for d in range(n, -1, -1):
+            mesh = lsystem_tree(grammar, slices, max_depth=d, leaves=leaves)
+            if len(mesh) <= budget:
+                return mesh
+    return None
+
+# Per-tree vertex budgets. The near LOD is baked each frame for the few trees inside the first
+# LOD distance; meshes up to bake_verts are baked into every tree once and drawn in one call.
+near_verts = 1536
+bake_verts = 128
+
+def tree_lods(lsys=None):
+    if lsys is None:
+        return [tree_mesh(8, 10), tree_mesh(4, 5), tree_billboard()]
+    # Both L-system LODs keep every leaf cluster of as many iterations as fit, so the crown keeps
+    # its shape; the budget comes out of the twigs first. With the default grammar that is the
+    # full crown with its two thickest branch orders near, and two iterations on a bare trunk
+    # with tetrahedral leaves in the middle.
+    near = fit_lsystem_tree(lsys, near_verts) or tree_mesh(8, 10)
+    middle = fit_lsystem_tree(lsys, bake_verts, leaves="tetra") or tree_mesh(4, 5)
+    return [near, middle, tree_billboard()]
@@ -0,0 +1,269 @@
+import numpy as np
+
+class RainPool:
+    # Rows x, y, z and fall speed, one contiguous row each: every per-drop pass below walks
+    # one row at full stride rather than every third float of an (n, 3) array
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.count    = 0
+        self.data     = np.empty((4, capacity), dtype=np.float32)
+        self.speed    = self.data[3]
+
+    def __len__(self):
+        return self.count
+
+    def live(self):
+        # (n, 3) positions, a transposed view
+        return self.data[:3, :self.count].T
+
+    def clear(self):
+        self.count = 0
+
+    def spawn(self, n, lo=(-20,10,-20), hi=(20,20,20), speed=(9,12), rng=np.random):
+        n = min(int(n), self.capacity - self.count)
+        if n <= 0: return 0
+        s = slice(self.count, self.count + n)
+        # The same draws as rng.uniform(lo, hi, (n, 3)), which takes a slow path for per-axis bounds
+        lo = np.asarray(lo, dtype=np.float64)
+        self.data[:3, s] = (rng.random((n, 3)) * (np.asarray(hi, dtype=np.float64) - lo) + lo).T
+        self.speed[s] = rng.uniform(speed[0], speed[1], n)
+        self.count += n
+        return n
+
+    def update(self, dt, wind=(0.0, 0.0), box=None, ground=None, ceiling=None):
+        # Fall and drift with the wind. With box=(x0, z0, size) drops leaving the square wrap
+        # to its far side, so a fixed pool covers wherever the box is. Drops at or below the
+        # ground (a height function, or y=0) are removed; their landing points are returned.
+        # Given the `ceiling` the ground never rises above, only drops under it look it up.
+        n = self.count
+        if n == 0: return np.zeros((0, 3), dtype=np.float32)
+        x, y, z, speed = self.data[:, :n]
+        y -= speed * dt
+        if wind[0] or wind[1]:
+            x += float(wind[0]) * dt
+            z += float(wind[1]) * dt
+        if box is not None:
+            x0, z0, size = box
+            xz = self.data[0:3:2, :n]
+            lo, hi = np.minimum.reduce(xz, axis=1).tolist(), np.maximum.reduce(xz, axis=1).tolist()
+            for c, o, a, b in ((x, x0, lo[0], hi[0]), (z, z0, lo[1], hi[1])):
+                # Few drops cross an edge per tick: find them, then wrap just those
+                if a >= o and b < o + size: continue
+                out = np.flatnonzero((c < o) | (c >= o + size))
+                c[out] = (c[out] - o) % size + o
+        if ground is None:
+            dead, floor = np.flatnonzero(y <= 0.0), 0.0
+        else:
+            low = np.flatnonzero(y <= ceiling) if ceiling is not None else np.arange(n)
+            if len(low) == 0: return np.zeros((0, 3), dtype=np.float32)
+            floor = ground(x[low], z[low])
+            landed = y[low] <= floor
+            dead, floor = low[landed], floor[landed]
+        k = len(dead)
+        if k == 0: return np.zeros((0, 3), dtype=np.float32)
+        hits = self.data[:3, dead].T
+        hits[:, 1] = floor
+        # Swap-remove: live drops past the new end fill the holes before it
+        m = n - k
+        j = int(np.searchsorted(dead, m))
+        holes = dead[:j]
+        keep = np.ones(k, dtype=bool)
+        keep[dead[j:] - m] = False
+        movers = m + np.flatnonzero(keep)
+        self.data[:, holes] = self.data[:, movers]
+        self.count = m
+        return hits
+
+class SplashPool:
+    # Droplets thrown up where rain lands: a few per drop, all spawned in one batch per tick.
+    # Rows x, y, z, vx, vy, vz and age like RainPool. Every droplet lives `life` seconds and
+    # they are appended in time order, so the expired ones are always a prefix: expiry just
+    # moves `head`, and the live run is shifted back to 0 only when a batch won't fit.
+    def __init__(self, capacity=2000, per=3, life=0.3, speed=(0.8, 1.6), gravity=9.8):
+        self.capacity = capacity
+        self.per      = per
+        self.life     = life
+        self.speed    = speed
+        self.gravity  = gravity
+        self.head     = 0
+        self.count    = 0
+        self.data     = np.empty((7, capacity), dtype=np.float32)
+
+    def __len__(self):
+        return self.count
+
+    def _live(self):
+        return self.data[:, self.head:self.head + self.count]
+
+    def live(self):
+        return self._live()[:3].T
+
+    def velocity(self):
+        return self._live()[3:6].T
+
+    @property
+    def age(self):
+        return self._live()[6]
+
+    def clear(self):
+        self.head = self.count = 0
+
+    def burst(self, points, rng=np.random):
+        # `per` droplets from each landing point, fanned out and up; the newest are dropped
+        # when the pool is full
+        n = min(len(points) * self.per, self.capacity - self.count)
+        if n <= 0: return 0
+        if self.head + self.count + n > self.capacity:
+            self.data[:, :self.count] = self._live()
+            self.head = 0
+        end = self.head + self.count
+        d = self.data[:, end:end + n]
+        d[:3] = np.repeat(points, self.per, axis=0)[:n].T
+        a = rng.uniform(0.0, 2 * np.pi, n)
+        v = rng.uniform(self.speed[0], self.speed[1], n)
+        d[3] = np.cos(a) * v * 0.5
+        d[4] = v
+        d[5] = np.sin(a) * v * 0.5
+        d[6] = 0.0
+        self.count += n
+        return n
+
+    def update(self, dt):
+        if self.count == 0: return
+        d = self._live()
+        d[6] += dt
+        d[4] -= self.gravity * dt
+        d[:3] += d[3:6] * dt
+        k = self.count - int(np.searchsorted(d[6, ::-1], self.life))
+        self.head  += k
+        self.count -= k
+
+class ParticleEmitter:
+    # Ring buffer of puffs rising from any number of sources. Every puff lives exactly
+    # `life` seconds, so the oldest always sit at `head` and expire first.
+    #
+    # A puff is only its spawn point and birth time on the emitter's clock; position, age,
+    # alpha and size follow from those and are worked out when read. A tick just moves the
+    # clock, so between bursts and expiries the smoke costs nothing.
+    def __init__(self, burst=4, every=0.1, life=3.0, rise=1.0, spread=0.1,
+                 size=(0.2, 0.15), rng=None):
+        self.burst   = burst
+        self.every   = every
+        self.life    = life
+        self.rise    = rise
+        self.spread  = spread
+        self.size0, self.growth = size
+        self.rng     = rng or np.random.default_rng()
+        self.sources = np.zeros((0, 3), dtype=np.float32)
+        self.clock   = 0.0
+        self.timer   = 0.0
+        self.head    = 0
+        self.count   = 0
+        self._alloc(0)
+
+    def _alloc(self, capacity):
+        self.capacity = capacity
+        self.base   = np.zeros((capacity, 3), dtype=np.float32)
+        self.born   = np.zeros(capacity)
+        self._pos   = np.zeros((capacity, 3), dtype=np.float32)
+        self._age   = np.zeros(capacity, dtype=np.float32)
+        self._alpha = np.zeros(capacity, dtype=np.float32)
+        self._size  = np.zeros(capacity, dtype=np.float32)
+        self._at    = None
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def pos(self):
+        return self._derived()[0]
+
+    @property
+    def age(self):
+        return self._derived()[1]
+
+    @property
+    def alpha(self):
+        return self._derived()[2]
+
+    @property
+    def size(self):
+        return self._derived()[3]
+
+    def add_source(self, x, y, z):
+        old = [a[s] for s in self.segments() for a in (self.base, self.born)]
+        self.sources = np.vstack([self.sources, np.float32([(x, y, z)])])
+        self._burst  = np.repeat(self.sources, self.burst, axis=0)
+        bursts = int(np.ceil(self.life / self.every)) + 2
+        self._alloc(bursts * self.burst * len(self.sources))
+        n = 0
+        for p, b in zip(old[0::2], old[1::2]):
+            self.base[n:n + len(b)], self.born[n:n + len(b)] = p, b
+            n += len(b)
+        self.head = 0
+        return len(self.sources) - 1
+
+    def load(self, pos, age, clock=0.0):
+        # Fill the ring as laid out from positions and ages, as older snapshots stored it
+        self.clock = clock
+        self.born[:] = clock - age
+        self.base[:] = pos
+        self.base[:, 1] -= self.rise * age
+        self._at = None
+
+    def segments(self):
+        # Live range as one or two slices in oldest-first order
+        end = self.head + self.count
+        if end <= self.capacity:
+            return [slice(self.head, end)]
+        return [slice(self.head, self.capacity), slice(0, end - self.capacity)]
+
+    def spawn(self):
+        k = self.burst * len(self.sources)
+        if k == 0: return
+        i = (self.head + self.count) % self.capacity
+        idx = slice(i, i + k) if i + k <= self.capacity else (i + np.arange(k)) % self.capacity
+        jitter = self.rng.uniform(-self.spread, self.spread, (k, 2))
+        self.base[idx] = self._burst
+        self.base[idx, 0] += jitter[:, 0]
+        self.base[idx, 2] += jitter[:, 1]
+        self.born[idx] = self.clock
+        over = max(0, self.count + k - self.capacity)
+        self.head  = (self.head + over) % self.capacity
+        self.count = min(self.count + k, self.capacity)
+        self._at = None
+
+    def _derived(self):
+        if self._at != self.clock:
+            for s in self.segments():
+                age = self._age[s]
+                np.subtract(self.clock, self.born[s], out=age, casting="same_kind")
+                self._pos[s] = self.base[s]
+                self._pos[s, 1] += self.rise * age
+                a = self._alpha[s]
+                np.multiply(age, -1.0 / self.life, out=a)
+                a += 1.0
+                np.clip(a, 0.0, 1.0, out=a)
+                np.multiply(age, self.growth, out=self._size[s])
+                self._size[s] += self.size0
+            self._at = self.clock
+        return self._pos, self._age, self._alpha, self._size
+
+    def update(self, dt):
+        self.timer += dt
+        if self.timer > self.every:
+            self.spawn()
+            self.timer = 0.0
+        self.clock += dt
+        # Births rise from head to tail, so the expired puffs are a prefix; the oldest alone
+        # says whether there are any
+        if self.count == 0 or self.clock - self.born[self.head] < self.life:
+            return
+        expired = 0
+        for s in self.segments():
+            born = self.born[s]
+            k = int(np.searchsorted(born, self.clock - self.life, side="right"))
+            expired += k
+            if k < len(born): break
+        self.head  = (self.head + expired) % max(self.capacity, 1)
+        self.count -= expired
@@ -0,0 +1,128 @@
+import csv
+import json
+import time
+from collections import deque
+import numpy as np
+
+class _Scope:
+    __slots__ = ("prof", "name", "t0")
+
+    def __init__(self, prof, name):
+        self.prof = prof
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        ms = (time.perf_counter() - self.t0) * 1000.0
+        frame = self.prof.frame
+        frame[self.name] = frame.get(self.name, 0.0) + ms
+
+class _NullScope:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+class NullProfiler:
+    enabled = False
+    _scope = _NullScope()
+
+    def scope(self, name):
+        return self._scope
+
+    def count(self, name, n):
+        pass
+
+    def begin_frame(self):
+        pass
+
+    def end_frame(self):
+        pass
+
+class Profiler:
+    enabled = True
+
+    def __init__(self, window=300, record=False):
+        self.window   = window
+        self.record   = record
+        self.samples  = {}
+        self.frame    = {}
+        self.history  = []
+        self.frames   = 0
+        self.gl_calls = 0
+        self.counters = {"gl_calls"}
+        self._t0      = None
+
+    def scope(self, name):
+        return _Scope(self, name)
+
+    def count(self, name, n):
+        # Per-frame tally that isn't a time, e.g. elided state calls
+        self.frame[name] = self.frame.get(name, 0) + n
+        self.counters.add(name)
+
+    def begin_frame(self):
+        self.frame    = {}
+        self.gl_calls = 0
+        self._t0      = time.perf_counter()
+
+    def end_frame(self):
+        if self._t0 is None: return
+        self.frame["frame"] = (time.perf_counter() - self._t0) * 1000.0
+        self.frame["gl_calls"] = self.gl_calls
+        for name, v in self.frame.items():
+            if name not in self.samples:
+                self.samples[name] = deque(maxlen=self.window)
+            self.samples[name].append(v)
+        if self.record:
+            self.history.append(dict(self.frame, index=self.frames))
+        self.frames += 1
+        self._t0 = None
+
+    def summary(self):
+        out = {}
+        for name, d in self.samples.items():
+            a = np.fromiter(d, dtype=np.float64, count=len(d))
+            p95, p99 = np.percentile(a, (95, 99))
+            out[name] = {"mean": float(a.mean()), "p95": float(p95), "p99": float(p99), "max": float(a.max())}
+        return out
+
+    def dump(self, path):
+        if path.endswith(".json"):
+            with open(path, "w") as f:
+                json.dump({"frames": self.history, "summary": self.summary()}, f, indent=1)
+            return
+        names = ["index", "frame", "gl_calls"]
+        for row in self.history:
+            names += [k for k in row if k not in names]
+        with open(path, "w", newline="") as f:
+            w = csv.DictWriter(f, fieldnames=names)
+            w.writeheader()
+            w.writerows(self.history)
+
+def instrument_gl(profiler, *modules):
+    # Swap each module's OpenGL entry points for counting wrappers; idempotent. Only names
+    # bound to an OpenGL.GL/GLU function are wrapped, so a call is counted when it reaches GL:
+    # helpers that merely start with "gl" aren't, and state the GLState cache elides never
+    # gets here, keeping gl_calls and gl_elided disjoint.
+    from OpenGL import GL, GLU
+    for mod in modules:
+        ns = vars(mod)
+        for name, fn in list(ns.items()):
+            if not name.startswith("gl") or hasattr(fn, "_counted"): continue
+            if fn is getattr(GL, name, None) or fn is getattr(GLU, name, None):
+                ns[name] = _counting(profiler, fn)
+
+def _counting(profiler, fn):
+    def wrapped(*args, **kw):
+        profiler.gl_calls += 1
+        return fn(*args, **kw)
+    wrapped._counted = fn
+    wrapped.__name__ = getattr(fn, "__name__", "gl")
+    return wrapped
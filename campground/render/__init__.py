@@ -0,0 +1,23 @@
+# Everything that needs PyOpenGL (or pygame) lives in this package, and nothing outside it
+# imports it at module level. Names load on first use, so `import campground.render` alone
+# still leaves GL unloaded.
+import importlib
+
+_exports = {
+    "SceneRenderer":   "scene",
+    "gl_modules":      "scene",
+    "ClusteredShading": "shading",
+    "FrameTarget":     "capture",
+    "PixelReader":     "capture",
+    "FrameWriter":     "capture",
+    "open_sink":       "capture",
+    "ProfilerOverlay": "overlay",
+}
+
+def __getattr__(name):
+    mod = _exports.get(name)
+    if mod is None:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    value = getattr(importlib.import_module("%s.%s" % (__name__, mod)), name)
+    globals()[name] = value
+    return value
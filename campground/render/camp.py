@@ -0,0 +1,95 @@
+import math
+import numpy as np
+from OpenGL.GL import *
+from campground.culling import LodPicker
+from campground.meshes import Mesh
+from campground.render.forest import Forest
+from campground.render.glstate import state as gls
+
+# One campsite in its own frame; Forest transforms place, turn and scale copies of it
+pit_r      = 0.5
+s_amount   = 13
+s_rad      = 0.12
+f_height   = 0.6
+f_base     = 0.1
+f_offsets  = [(0.2, 0.0), (-0.2, 0.0), (0.0, 0.2)]
+# Fixed-function attenuation never reaches zero; the shader path fades it out by `range`
+fire_light = {"ambient": (0.4, 0.2, 0.1, 1.0), "diffuse": (1.0, 0.8, 0.4, 1.0),
+              "attenuation": (0.1, 0.01, 0.002), "range": 25.0}
+
+def tent_mesh(cache):
+    # Unit pyramid plus the door seam: a thin strip down the front face, nudged off the surface
+    face = np.array([0.0, 1.0, -1.0]) / math.sqrt(2.0)
+    top, bottom, w = np.array([0.0, 1.0, 0.0]), np.array([0.0, 0.0, -1.0]), 0.02
+    seam = np.array([top - (w, 0, 0), bottom - (w, 0, 0), bottom + (w, 0, 0), top + (w, 0, 0)]) + 0.01 * face
+    seam = Mesh(seam, np.tile(face, (4, 1)), [0, 1, 2, 0, 2, 3])
+    return cache.bake([("pyramid", 4, 1, [(0, 0, 0, 0, 1, 1)], (0.0, 0.0, 0.0)),
+                       (seam, 0, 0, [(0, 0, 0, 0, 1, 1)], (1.0, 1.0, 1.0))])
+
+def pit_mesh(cache, slices, stacks):
+    a = 2 * np.pi * np.arange(s_amount) / s_amount
+    stones = [(pit_r * math.cos(t), s_rad, pit_r * math.sin(t), 0, s_rad, s_rad) for t in a.tolist()]
+    return cache.bake([("sphere", slices, stacks, stones, (0.6, 0.6, 0.6))])
+
+def flame_mesh(cache, slices):
+    return cache.bake([("cone", slices, 1, [(x, 0, z, 0, f_base, f_height) for x, z in f_offsets], (1.0, 0.5, 0.0))])
+
+class CampRenderer:
+    # Tents, pits and flames of every campsite as three batched forests, plus the fire lights
+    def __init__(self, sites, cache, max_lights=7, lod_dist=30.0):
+        self.sites = sites
+        self.max_lights = max_lights
+        scale = sites.fire_radius / pit_r
+        fires = np.column_stack([sites.fires[:, 0], sites.fire_y, sites.fires[:, 1], np.zeros(len(sites)), scale, scale])
+        tents = np.column_stack([sites.tents[:, 0], sites.tent_y, sites.tents[:, 1], sites.tent_yaw,
+                                 sites.tent_size[:, 0], sites.tent_size[:, 1]])
+        # Per-site meshes are a few hundred vertices: bake them all rather than streaming
+        big = 1 << 30
+        self.layers = [
+            ("tents",  Forest(tents, [tent_mesh(cache)], stream_above=big), LodPicker(())),
+            ("pits",   Forest(fires, [pit_mesh(cache, 10, 8), pit_mesh(cache, 5, 3)], stream_above=big),
+             LodPicker((lod_dist,))),
+            ("flames", Forest(fires[sites.lit], [flame_mesh(cache, 16), flame_mesh(cache, 5)], stream_above=big),
+             LodPicker((lod_dist,))),
+        ]
+        self.bounds = [f.bounds() for _, f, _ in self.layers]
+        # Homogeneous light positions as tuples, ready for glLightfv and the state cache
+        self.pts = [(x, y, z, 1.0) for x, y, z in sites.fire_points(0.2, lit_only=False).tolist()]
+        self.lit_pts = sites.fire_points(0.2)
+        for k in range(max_lights):
+            light = GL_LIGHT1 + k
+            gls.light(light, GL_DIFFUSE, fire_light["diffuse"])
+            gls.light(light, GL_SPECULAR, fire_light["diffuse"])
+            # Only the nearest fire adds ambient, or a crowd of fires would wash the scene out
+            gls.light(light, GL_AMBIENT, fire_light["ambient"] if k == 0 else (0.0, 0.0, 0.0, 1.0))
+            for pname, v in zip((GL_CONSTANT_ATTENUATION, GL_LINEAR_ATTENUATION, GL_QUADRATIC_ATTENUATION),
+                                fire_light["attenuation"]):
+                gls.light(light, pname, v)
+            gls.disable(light)
+
+    def apply_lights(self, eye, night):
+        # Fixed function has 8 lights and the sun holds LIGHT0: the nearest lit fires get the rest.
+        # Call after the view matrix is loaded so positions land in eye space correctly.
+        ids = self.sites.nearest_fires(eye, self.max_lights) if night else []
+        pts = self.pts
+        for k in range(self.max_lights):
+            light = GL_LIGHT1 + k
+            if k < len(ids):
+                gls.light_position(light, pts[ids[k]])
+                gls.enable(light)
+            else:
+                gls.disable(light)
+        return len(ids)
+
+    def fire_lights(self, night):
+        # Every lit fire for the shader path, which has no light limit
+        return self.lit_pts if night else self.lit_pts[:0]
+
+    def render(self, culler):
+        for (name, forest, lod), (centres, radii) in zip(self.layers, self.bounds):
+            if len(forest) == 0: continue
+            forest.render(culler.cull(name, np.arange(len(forest)), centres, radii, lod=lod))
+
+    def delete(self):
+        for _, forest, _ in self.layers:
+            forest.delete()
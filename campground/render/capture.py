@@ -0,0 +1,181 @@
+import ctypes
+import os
+import queue
+import shlex
+import struct
+import subprocess
+import sys
+import threading
+import zlib
+from collections import deque
+import numpy as np
+from OpenGL.GL import *
+
+class FrameTarget:
+    # Framebuffer object with its own colour and depth storage, so the scene renders at any
+    # resolution no matter how big (or small) the window or pbuffer behind the context is
+    def __init__(self, width, height):
+        self.width  = width
+        self.height = height
+        self.fbo    = glGenFramebuffers(1)
+        self.color, self.depth = glGenRenderbuffers(2)
+        glBindRenderbuffer(GL_RENDERBUFFER, self.color)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_RGBA8, width, height)
+        glBindRenderbuffer(GL_RENDERBUFFER, self.depth)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_DEPTH_COMPONENT24, width, height)
+        glBindRenderbuffer(GL_RENDERBUFFER, 0)
+        glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_RENDERBUFFER, self.color)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_DEPTH_ATTACHMENT, GL_RENDERBUFFER, self.depth)
+        status = glCheckFramebufferStatus(GL_FRAMEBUFFER)
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+        if status != GL_FRAMEBUFFER_COMPLETE:
+            self.delete()
+            raise RuntimeError("framebuffer incomplete: 0x%x" % status)
+
+    def bind(self):
+        glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
+        glViewport(0, 0, self.width, self.height)
+
+    def unbind(self):
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+
+    def delete(self):
+        glDeleteFramebuffers(1, [self.fbo])
+        glDeleteRenderbuffers(2, [self.color, self.depth])
+
+class PixelReader:
+    # glReadPixels into a ring of pixel buffer objects. The copy for frame N is only mapped
+    # once frame N+count-1 has been queued, so the GPU finishes it while the CPU moves on.
+    def __init__(self, width, height, count=2):
+        self.width  = width
+        self.height = height
+        self.size   = width * height * 4
+        self.pbos   = glGenBuffers(count) if count > 1 else [glGenBuffers(1)]
+        self.next   = 0
+        self.pending = deque()
+        for pbo in self.pbos:
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+            glBufferData(GL_PIXEL_PACK_BUFFER, self.size, None, GL_STREAM_READ)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+
+    def read(self, tag=None):
+        # Queue a copy of the bound framebuffer; returns (tag, rgba) of the oldest copy once
+        # the ring is full, else None
+        pbo = self.pbos[self.next]
+        self.next = (self.next + 1) % len(self.pbos)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+        glReadPixels(0, 0, self.width, self.height, GL_RGBA, GL_UNSIGNED_BYTE, ctypes.c_void_p(0))
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self.pending.append((pbo, tag))
+        if len(self.pending) < len(self.pbos): return None
+        return self._map(*self.pending.popleft())
+
+    def drain(self):
+        while self.pending:
+            yield self._map(*self.pending.popleft())
+
+    def _map(self, pbo, tag):
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+        ptr = glMapBuffer(GL_PIXEL_PACK_BUFFER, GL_READ_ONLY)
+        data = ctypes.string_at(ptr, self.size)
+        glUnmapBuffer(GL_PIXEL_PACK_BUFFER)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        # Rows come back bottom-up; the writer flips them off the render thread
+        return tag, np.frombuffer(data, dtype=np.uint8).reshape(self.height, self.width, 4)
+
+    def delete(self):
+        glDeleteBuffers(len(self.pbos), list(self.pbos))
+
+def _chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+def encode_png(rgb, level=6):
+    # 8-bit RGB PNG, filter type 0 on every row; zlib releases the GIL while it compresses
+    h, w, _ = rgb.shape
+    raw = np.zeros((h, w * 3 + 1), dtype=np.uint8)
+    raw[:, 1:] = rgb.reshape(h, w * 3)
+    header = struct.pack(">IIBBBBB", w, h, 8, 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + _chunk(b"IHDR", header)
+            + _chunk(b"IDAT", zlib.compress(raw.tobytes(), level)) + _chunk(b"IEND", b""))
+
+class PngSequence:
+    def __init__(self, pattern, level=6):
+        self.pattern = pattern
+        self.level   = level
+        os.makedirs(os.path.dirname(pattern) or ".", exist_ok=True)
+
+    def write(self, index, rgba):
+        with open(self.pattern % index, "wb") as f:
+            f.write(encode_png(rgba[::-1, :, :3], self.level))
+
+    def close(self):
+        pass
+
+class RawStream:
+    # Top-down RGBA frames back to back, to a file, stdout ("-") or a command's stdin ("|cmd")
+    def __init__(self, target, width, height):
+        self.proc = None
+        if target.startswith("|"):
+            cmd = target[1:].format(width=width, height=height)
+            self.proc = subprocess.Popen(shlex.split(cmd), stdin=subprocess.PIPE)
+            self.out = self.proc.stdin
+        elif target == "-":
+            self.out = sys.stdout.buffer
+        else:
+            self.out = open(target, "wb")
+
+    def write(self, index, rgba):
+        self.out.write(np.ascontiguousarray(rgba[::-1]).data)
+
+    def close(self):
+        if self.out is not sys.stdout.buffer:
+            self.out.close()
+        else:
+            self.out.flush()
+        if self.proc and self.proc.wait() != 0:
+            raise RuntimeError("capture command exited with status %d" % self.proc.returncode)
+
+def open_sink(target, width, height, level=6):
+    # "frames/%05d.png" -> PNG sequence; "|ffmpeg ... -s {width}x{height} -i - out.mp4",
+    # "-" or any other path -> raw RGBA stream
+    if "%" in target and target.lower().endswith(".png"):
+        return PngSequence(target, level)
+    return RawStream(target, width, height)
+
+class FrameWriter:
+    # Encodes and writes frames on a background thread. The queue is bounded so a slow disk
+    # holds the renderer back instead of buffering the whole timelapse in memory.
+    def __init__(self, sink, depth=8):
+        self.sink    = sink
+        self.queue   = queue.Queue(maxsize=depth)
+        self.error   = None
+        self.written = 0
+        self.stalls  = 0
+        self.thread  = threading.Thread(target=self._run, name="frame-writer", daemon=True)
+        self.thread.start()
+
+    def write(self, index, rgba):
+        if self.error: raise self.error
+        if self.queue.full():
+            self.stalls += 1
+        self.queue.put((index, rgba))
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None: break
+            if self.error: continue
+            try:
+                self.sink.write(*item)
+                self.written += 1
+            except Exception as e:
+                self.error = e
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+        try:
+            self.sink.close()
+        finally:
+            if self.error: raise self.error
@@ -0,0 +1,168 @@
+import ctypes
+import numpy as np
+from OpenGL.GL import *
+from campground.meshes import bake_verts, tree_lods
+from campground.render.particles import StreamBuffer
+
+# Per-tree transform columns: x, y, z, yaw (degrees), width scale, height scale
+X, Y, Z, YAW, SW, SH = range(6)
+
+def bake(mesh, transforms):
+    t = np.asarray(transforms, dtype=np.float32)
+    n, m = len(t), len(mesh)
+    yaw = np.radians(t[:, YAW])[:, None]
+    c, s = np.cos(yaw), np.sin(yaw)
+    sw, sh = t[:, SW][:, None], t[:, SH][:, None]
+
+    lx, ly, lz = (mesh.verts[None, :, k] for k in range(3))
+    verts = np.empty((n, m, 3), dtype=np.float32)
+    verts[..., 0] = c * lx * sw + s * lz * sw + t[:, X][:, None]
+    verts[..., 1] = ly * sh + t[:, Y][:, None]
+    verts[..., 2] = c * lz * sw - s * lx * sw + t[:, Z][:, None]
+
+    # Normals take the inverse scale, then the same yaw
+    nx, ny, nz = (mesh.normals[None, :, k] for k in range(3))
+    nx, ny, nz = nx / sw, ny / sh, nz / sw
+    norms = np.empty((n, m, 3), dtype=np.float32)
+    norms[..., 0] = c * nx + s * nz
+    norms[..., 1] = ny
+    norms[..., 2] = c * nz - s * nx
+    norms /= np.linalg.norm(norms, axis=-1, keepdims=True)
+
+    colors = np.broadcast_to(mesh.colors, (n, m, 4))
+    indices = (mesh.indices[None, :] + (np.arange(n, dtype=np.uint32) * m)[:, None]).astype(np.uint32)
+    return verts.reshape(-1, 3), norms.reshape(-1, 3), colors.reshape(-1, 4), indices.ravel()
+
+class Forest:
+    # LODs above `stream_above` vertices per tree keep one copy of the mesh; each frame the
+    # visible trees are baked from it into a stream buffer (again only when that set changes)
+    # and drawn in one call. Baking them for every tree up front costs too much memory.
+    # tree_lods() keeps only the near level that big, so that is a handful of trees a frame.
+    def __init__(self, transforms=None, lods=None, stream_above=bake_verts):
+        self.transforms = np.zeros((0, 6), dtype=np.float32) if transforms is None \
+            else np.asarray(transforms, dtype=np.float32).reshape(-1, 6)
+        self.lods   = lods or tree_lods()
+        self.streamed = [len(m) > stream_above for m in self.lods]
+        self.layers = None
+        self.index  = None
+        self._bounds = None
+
+    @classmethod
+    def from_trees(cls, trees, lods=None):
+        # One forest draws one grammar; its meshes come from the first tree's L-system
+        if lods is None and trees:
+            lods = tree_lods(trees[0].lsys)
+        return cls([t.transform() for t in trees], lods)
+
+    def __len__(self):
+        return len(self.transforms)
+
+    def bounds(self):
+        # Bounding sphere per tree around the trunk axis, covering every LOD mesh
+        if self._bounds is None:
+            t = self.transforms
+            y0 = min(float(m.verts[:, 1].min()) for m in self.lods)
+            y1 = max(float(m.verts[:, 1].max()) for m in self.lods)
+            rh = max(float(np.hypot(m.verts[:, 0], m.verts[:, 2]).max()) for m in self.lods)
+            half = 0.5 * (y1 - y0) * t[:, SH]
+            centers = t[:, X:Z+1].copy()
+            centers[:, 1] += y0 * t[:, SH] + half
+            self._bounds = centers, np.hypot(half, rh * t[:, SW])
+        return self._bounds
+
+    def level_data(self, level):
+        # CPU side of one LOD layer: nothing up front if it is streamed, every tree baked if not.
+        # Pure NumPy, so the loader can build it off the GL thread.
+        if self.streamed[level]:
+            return None
+        verts, norms, colors, _ = bake(self.lods[level], self.transforms)
+        return verts, norms, np.ascontiguousarray(colors)
+
+    def reserve(self):
+        # Empty layer slots; render() draws whatever has been uploaded into them so far
+        if self.layers is None:
+            n = len(self.lods)
+            self.layers  = [None] * n
+            self.offsets = [None] * n
+            self.baked   = [None] * n
+            self.index   = StreamBuffer(GL_ELEMENT_ARRAY_BUFFER)
+
+    def _fill(self, level, verts, norms, colors, usage=GL_STATIC_DRAW):
+        # Vertex, normal and colour arrays back to back in the level's buffer
+        glBindBuffer(GL_ARRAY_BUFFER, self.layers[level])
+        glBufferData(GL_ARRAY_BUFFER, verts.nbytes + norms.nbytes + colors.nbytes, None, usage)
+        glBufferSubData(GL_ARRAY_BUFFER, 0, verts.nbytes, verts)
+        glBufferSubData(GL_ARRAY_BUFFER, verts.nbytes, norms.nbytes, norms)
+        glBufferSubData(GL_ARRAY_BUFFER, verts.nbytes + norms.nbytes, colors.nbytes, colors)
+        self.offsets[level] = (verts.nbytes, verts.nbytes + norms.nbytes)
+
+    def upload_level(self, level, data=None):
+        self.reserve()
+        self.layers[level] = glGenBuffers(1)
+        if not self.streamed[level]:
+            self._fill(level, *(self.level_data(level) if data is None else data))
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def stream(self, level, ids):
+        # Bake a streamed level for these trees, unless it already holds exactly them
+        if self.baked[level] is not None and np.array_equal(self.baked[level], ids):
+            return
+        verts, norms, colors, _ = bake(self.lods[level], self.transforms[ids])
+        self._fill(level, verts, norms, np.ascontiguousarray(colors), GL_STREAM_DRAW)
+        self.baked[level] = ids.copy()
+
+    def upload(self):
+        self.reserve()
+        for level, vbo in enumerate(self.layers):
+            if vbo is None:
+                self.upload_level(level)
+
+    def fallback(self, by_level):
+        # Trees whose LOD is still loading borrow the nearest level that has arrived
+        have = [k for k, vbo in enumerate(self.layers) if vbo is not None]
+        if len(have) == len(self.layers) or not have:
+            return by_level
+        out = [[] for _ in self.layers]
+        for level, ids in enumerate(by_level):
+            out[min(have, key=lambda k: abs(k - level))].append(np.asarray(ids))
+        return [np.concatenate(ids) if ids else np.zeros(0, dtype=np.int64) for ids in out]
+
+    def render(self, by_level=None):
+        # by_level: tree ids to draw with each LOD mesh; default is every tree at full detail
+        if self.layers is None:
+            self.upload()
+        if by_level is None:
+            by_level = [np.arange(len(self))]
+        by_level = self.fallback(by_level)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_NORMAL_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        for level, (vbo, mesh, ids) in enumerate(zip(self.layers, self.lods, by_level)):
+            if vbo is None or len(ids) == 0: continue
+            glBindBuffer(GL_ARRAY_BUFFER, vbo)
+            if self.streamed[level]:
+                ids = np.asarray(ids)
+                self.stream(level, ids)
+                slots = np.arange(len(ids), dtype=np.uint32)
+            else:
+                slots = np.asarray(ids, dtype=np.uint32)
+            norm_off, color_off = self.offsets[level]
+            glVertexPointer(3, GL_FLOAT, 0, None)
+            glNormalPointer(GL_FLOAT, 0, ctypes.c_void_p(norm_off))
+            glColorPointer(4, GL_UNSIGNED_BYTE, 0, ctypes.c_void_p(color_off))
+            idx = (slots[:, None] * np.uint32(len(mesh)) + mesh.indices).ravel()
+            self.index.upload(idx)
+            glDrawElements(GL_TRIANGLES, len(idx), GL_UNSIGNED_INT, None)
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_NORMAL_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def delete(self):
+        if self.layers is not None:
+            layers = [b for b in self.layers if b is not None]
+            if layers:
+                glDeleteBuffers(len(layers), layers)
+            self.index.delete()
+            self.layers = None
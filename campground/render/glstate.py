@@ -0,0 +1,97 @@
+from OpenGL.GL import *
+
+_unset = object()
+
+class GLState:
+    # Shadow copy of the fixed-function state the renderers set. Calls that would leave GL as
+    # it already is are dropped and counted. Anything that changes state behind its back
+    # (a new context, glPopAttrib of a pushed change) must invalidate() it.
+    def __init__(self):
+        self.cache  = {}
+        self.view   = None
+        self.issued = 0
+        self.elided = 0
+        self.last   = {"issued": 0, "elided": 0}
+
+    def invalidate(self):
+        self.cache = {}
+        self.view  = None
+
+    def begin_frame(self):
+        self.issued = 0
+        self.elided = 0
+
+    def end_frame(self):
+        self.last = {"issued": self.issued, "elided": self.elided}
+        return self.last
+
+    def _changed(self, key, value):
+        if self.cache.get(key, _unset) == value:
+            self.elided += 1
+            return False
+        self.cache[key] = value
+        self.issued += 1
+        return True
+
+    def enable(self, cap):
+        if self._changed(("cap", cap), True):
+            glEnable(cap)
+
+    def disable(self, cap):
+        if self._changed(("cap", cap), False):
+            glDisable(cap)
+
+    def light(self, light, pname, value):
+        if self._changed(("light", light, pname), value):
+            if isinstance(value, tuple):
+                glLightfv(light, pname, value)
+            else:
+                glLightf(light, pname, value)
+
+    def light_position(self, light, pos):
+        # GL transforms positions into eye space when they are set, so one can only be
+        # skipped while the view it was given under is still loaded
+        if self._changed(("light", light, GL_POSITION), (pos, self.view)):
+            glLightfv(light, GL_POSITION, pos)
+
+    def light_model(self, pname, value):
+        if self._changed(("model", pname), value):
+            glLightModelfv(pname, value)
+
+    def fog(self, pname, value):
+        if self._changed(("fog", pname), value):
+            if isinstance(value, tuple):
+                glFogfv(pname, value)
+            elif isinstance(value, int):
+                glFogi(pname, value)
+            else:
+                glFogf(pname, value)
+
+    def blend_func(self, src, dst):
+        if self._changed("blend_func", (src, dst)):
+            glBlendFunc(src, dst)
+
+    def clear_color(self, rgba):
+        if self._changed("clear_color", rgba):
+            glClearColor(*rgba)
+
+    def depth_mask(self, flag):
+        if self._changed("depth_mask", bool(flag)):
+            glDepthMask(GL_TRUE if flag else GL_FALSE)
+
+    def line_width(self, width):
+        if self._changed("line_width", width):
+            glLineWidth(width)
+
+    def use_program(self, program):
+        if self._changed("program", program):
+            glUseProgram(program)
+
+    def load_view(self, matrix):
+        # Always loaded (everything drawn after depends on it), but remembered so light
+        # positions given under the same view can be skipped
+        glMatrixMode(GL_MODELVIEW)
+        glLoadMatrixf(matrix)
+        self.view = tuple(matrix)
+
+state = GLState()
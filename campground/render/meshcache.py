@@ -0,0 +1,32 @@
+from campground import meshes
+from campground.meshes import Mesh, merge
+from campground.render.forest import bake
+
+_shapes = {
+    "sphere":   lambda slices, stacks: meshes.sphere(slices, stacks),
+    "cone":     lambda slices, stacks: meshes.cone(1.0, 1.0, slices, stacks),
+    "cylinder": lambda slices, stacks: meshes.cylinder(slices, stacks),
+    "pyramid":  lambda slices, stacks: meshes.pyramid(slices),
+}
+
+class MeshCache:
+    # Unit shapes tessellated once per (kind, slices, stacks), for baking into camp batches
+    def __init__(self):
+        self.meshes = {}
+
+    def mesh(self, kind, slices=16, stacks=1):
+        key = (kind, slices, stacks)
+        if key not in self.meshes:
+            self.meshes[key] = _shapes[kind](slices, stacks)
+        return self.meshes[key]
+
+    def bake(self, parts):
+        # parts: (kind or Mesh, slices, stacks, transforms, rgb); transforms use the Forest
+        # columns x, y, z, yaw, width scale, height scale. Returns the merged Mesh.
+        baked = []
+        for kind, slices, stacks, transforms, rgb in parts:
+            m = self.mesh(kind, slices, stacks) if isinstance(kind, str) else kind
+            v, n, c, i = bake(m.colored(rgb), transforms)
+            baked.append(Mesh(v, n, i, c))
+        return merge(*baked)
+
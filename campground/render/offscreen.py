@@ -0,0 +1,70 @@
+import os
+import ctypes
+
+# PyOpenGL picks its platform once, on first import: call this before that.
+def use_platform(backend=None):
+    backend = backend or os.environ.get("PYOPENGL_PLATFORM") or "egl"
+    os.environ["PYOPENGL_PLATFORM"] = backend
+    if backend == "egl" and not os.environ.get("DISPLAY") and not os.environ.get("WAYLAND_DISPLAY"):
+        os.environ.setdefault("EGL_PLATFORM", "surfaceless")
+    return backend
+
+def create_context(width=800, height=600):
+    backend = use_platform()
+    if backend == "egl":
+        return EGLContext(width, height)
+    if backend == "osmesa":
+        return OSMesaContext(width, height)
+    raise ValueError("unknown offscreen backend: %s" % backend)
+
+class EGLContext:
+    def __init__(self, width, height):
+        from OpenGL import EGL
+        self.EGL    = EGL
+        self.width  = width
+        self.height = height
+        self.display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+        major, minor = EGL.EGLint(), EGL.EGLint()
+        EGL.eglInitialize(self.display, ctypes.pointer(major), ctypes.pointer(minor))
+        attrs = [EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+                 EGL.EGL_RED_SIZE, 8, EGL.EGL_GREEN_SIZE, 8, EGL.EGL_BLUE_SIZE, 8,
+                 EGL.EGL_ALPHA_SIZE, 8, EGL.EGL_DEPTH_SIZE, 24,
+                 EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT, EGL.EGL_NONE]
+        cfg, n = EGL.EGLConfig(), EGL.EGLint()
+        EGL.eglChooseConfig(self.display, (EGL.EGLint * len(attrs))(*attrs),
+                            ctypes.pointer(cfg), 1, ctypes.pointer(n))
+        if n.value == 0:
+            raise RuntimeError("no EGL config with desktop GL and a pbuffer surface")
+        size = [EGL.EGL_WIDTH, width, EGL.EGL_HEIGHT, height, EGL.EGL_NONE]
+        self.surface = EGL.eglCreatePbufferSurface(self.display, cfg, (EGL.EGLint * 5)(*size))
+        EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+        self.context = EGL.eglCreateContext(self.display, cfg, EGL.EGL_NO_CONTEXT, None)
+        EGL.eglMakeCurrent(self.display, self.surface, self.surface, self.context)
+
+    def swap(self):
+        self.EGL.eglSwapBuffers(self.display, self.surface)
+
+    def destroy(self):
+        EGL = self.EGL
+        EGL.eglMakeCurrent(self.display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, EGL.EGL_NO_CONTEXT)
+        EGL.eglDestroySurface(self.display, self.surface)
+        EGL.eglDestroyContext(self.display, self.context)
+        EGL.eglTerminate(self.display)
+
+class OSMesaContext:
+    def __init__(self, width, height):
+        from OpenGL import osmesa, arrays
+        from OpenGL.GL import GL_UNSIGNED_BYTE
+        self.osmesa  = osmesa
+        self.width   = width
+        self.height  = height
+        self.context = osmesa.OSMesaCreateContextExt(osmesa.OSMESA_RGBA, 24, 0, 0, None)
+        self.buffer  = arrays.GLubyteArray.zeros((height, width, 4))
+        if not osmesa.OSMesaMakeCurrent(self.context, self.buffer, GL_UNSIGNED_BYTE, width, height):
+            raise RuntimeError("OSMesaMakeCurrent failed")
+
+    def swap(self):
+        pass
+
+    def destroy(self):
+        self.osmesa.OSMesaDestroyContext(self.context)
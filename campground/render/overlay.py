@@ -0,0 +1,52 @@
+import pygame
+from OpenGL.GL import *
+
+class ProfilerOverlay:
+    def __init__(self, profiler, height, every=15):
+        pygame.font.init()
+        self.profiler = profiler
+        self.height   = height
+        self.every    = every
+        self.font     = pygame.font.SysFont("monospace", 14)
+        self.visible  = False
+        self._img     = None
+        self._n       = 0
+
+    def toggle(self):
+        self.visible = not self.visible
+        self._n = 0
+
+    def _lines(self, extra):
+        rows = ["%-16s %7s %7s %7s" % ("stage (ms)", "mean", "p95", "p99")]
+        prof = self.profiler
+        for name, st in sorted(prof.summary().items()):
+            if name in prof.counters:
+                continue
+            rows.append("%-16s %7.2f %7.2f %7.2f" % (name, st["mean"], st["p95"], st["p99"]))
+        for name in sorted(prof.counters):
+            s = prof.samples.get(name)
+            if s:
+                rows.append("%-16s %7d" % (name.replace("_", " ") + "/frame", s[-1]))
+        return rows + list(extra)
+
+    def draw(self, extra=()):
+        if not self.visible: return
+        if self._img is None or self._n % self.every == 0:
+            pg = pygame
+            lines = [self.font.render(t, True, (255, 255, 255)) for t in self._lines(extra)]
+            lh = self.font.get_linesize()
+            surf = pg.Surface((max(l.get_width() for l in lines) + 8, lh * len(lines) + 8), pg.SRCALPHA)
+            surf.fill((0, 0, 0, 160))
+            for i, l in enumerate(lines):
+                surf.blit(l, (4, 4 + i * lh))
+            self._img = (surf.get_width(), surf.get_height(), pg.image.tostring(surf, "RGBA", True))
+        self._n += 1
+        w, h, data = self._img
+        glPushAttrib(GL_ENABLE_BIT | GL_COLOR_BUFFER_BIT)
+        for cap in (GL_DEPTH_TEST, GL_LIGHTING, GL_FOG, GL_TEXTURE_2D):
+            glDisable(cap)
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        glWindowPos2i(8, self.height - 8 - h)
+        glDrawPixels(w, h, GL_RGBA, GL_UNSIGNED_BYTE, data)
+        glPopAttrib()
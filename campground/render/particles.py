@@ -0,0 +1,145 @@
+import ctypes
+import numpy as np
+from OpenGL.GL import *
+from campground.render.glstate import state as gls
+
+class StreamBuffer:
+    def __init__(self, target=GL_ARRAY_BUFFER):
+        self.target   = target
+        self.vbo      = glGenBuffers(1)
+        self.capacity = 0
+
+    def upload(self, data):
+        glBindBuffer(self.target, self.vbo)
+        if data.nbytes > self.capacity:
+            self.capacity = max(data.nbytes, 2 * self.capacity)
+        # Orphan last frame's storage so the driver never waits on it
+        glBufferData(self.target, self.capacity, None, GL_STREAM_DRAW)
+        glBufferSubData(self.target, 0, data.nbytes, data)
+
+    def delete(self):
+        glDeleteBuffers(1, [self.vbo])
+
+def _grow(buf, n):
+    if len(buf) >= n: return buf
+    return np.empty((max(n, 2 * len(buf)),) + buf.shape[1:], dtype=buf.dtype)
+
+class RainRenderer:
+    def __init__(self, streak=1.0, color=(0.7,0.8,1.0), width=2.0):
+        self.streak = streak
+        self.color  = color
+        self.width  = width
+        self.buf    = StreamBuffer()
+        self.verts  = np.empty((0, 2, 3), dtype=np.float32)
+
+    def draw(self, pos, speed=None, wind=(0.0, 0.0)):
+        # One streak per drop, `streak` long and leaning with the wind when speeds are given
+        n = len(pos)
+        if n == 0: return
+        self.verts = _grow(self.verts, n)
+        v = self.verts[:n]
+        v[:, 0] = pos
+        v[:, 1] = pos
+        v[:, 1, 1] -= self.streak
+        if speed is not None and (wind[0] or wind[1]):
+            k = self.streak / speed
+            v[:, 1, 0] += wind[0] * k
+            v[:, 1, 2] += wind[1] * k
+        self._lines(v)
+
+    def draw_splashes(self, pos, vel, blur=0.03):
+        # Droplets as short lines back along their velocity
+        n = len(pos)
+        if n == 0: return
+        self.verts = _grow(self.verts, n)
+        v = self.verts[:n]
+        v[:, 0] = pos
+        np.multiply(vel, -blur, out=v[:, 1])
+        v[:, 1] += pos
+        self._lines(v)
+
+    def _lines(self, v):
+        n = len(v)
+        self.buf.upload(v)
+        gls.line_width(self.width)
+        glColor3f(*self.color)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glVertexPointer(3, GL_FLOAT, 0, None)
+        glDrawArrays(GL_LINES, 0, 2 * n)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def delete(self):
+        self.buf.delete()
+
+_corners = np.array([(-1,-1), (1,-1), (1,1), (-1,1)], dtype=np.float32)
+_uvs     = (_corners + 1.0) * 0.5
+
+def _puff_texture(res=32):
+    r = np.hypot(*np.meshgrid(np.linspace(-1, 1, res), np.linspace(-1, 1, res)))
+    img = np.full((res, res, 4), 255, dtype=np.uint8)
+    img[..., 3] = (np.clip(1.0 - r * r, 0.0, 1.0) * 255).astype(np.uint8)
+    tex = glGenTextures(1)
+    glBindTexture(GL_TEXTURE_2D, tex)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+    glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, res, res, 0, GL_RGBA, GL_UNSIGNED_BYTE, img)
+    glBindTexture(GL_TEXTURE_2D, 0)
+    return tex
+
+class SmokeRenderer:
+    # Camera-facing textured quads: xyz, uv, rgba per corner
+    stride = 9 * 4
+
+    def __init__(self, color=(0.8,0.8,0.8)):
+        self.color = color
+        self.buf   = StreamBuffer()
+        self.tex   = _puff_texture()
+        self.verts = np.empty((0, 4, 9), dtype=np.float32)
+
+    def draw(self, pos, size, alpha):
+        self.draw_segments([(pos, size, alpha)])
+
+    def draw_emitter(self, emitter):
+        self.draw_segments([(emitter.pos[s], emitter.size[s], emitter.alpha[s]) for s in emitter.segments()])
+
+    def draw_segments(self, segments):
+        n = sum(len(seg[0]) for seg in segments)
+        if n == 0: return
+        m = glGetFloatv(GL_MODELVIEW_MATRIX)
+        right, up = m[:3, 0], m[:3, 1]
+        offs = _corners[:, :1] * right + _corners[:, 1:] * up
+        self.verts = _grow(self.verts, n)
+        i = 0
+        for pos, size, alpha in segments:
+            v = self.verts[i:i + len(pos)]
+            v[:, :, 0:3] = pos[:, None, :] + size[:, None, None] * offs
+            v[:, :, 3:5] = _uvs
+            v[:, :, 5:8] = self.color
+            v[:, :, 8]   = alpha[:, None]
+            i += len(pos)
+        self.buf.upload(self.verts[:n])
+
+        gls.depth_mask(False)
+        gls.enable(GL_TEXTURE_2D)
+        glBindTexture(GL_TEXTURE_2D, self.tex)
+        # Light puffs like the top of a sphere rather than edge-on
+        glNormal3f(0.0, 1.0, 0.0)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        glVertexPointer(3, GL_FLOAT, self.stride, ctypes.c_void_p(0))
+        glTexCoordPointer(2, GL_FLOAT, self.stride, ctypes.c_void_p(12))
+        glColorPointer(4, GL_FLOAT, self.stride, ctypes.c_void_p(20))
+        glDrawArrays(GL_QUADS, 0, 4 * n)
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_TEXTURE_COORD_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glBindTexture(GL_TEXTURE_2D, 0)
+        gls.disable(GL_TEXTURE_2D)
+        gls.depth_mask(True)
+
+    def delete(self):
+        self.buf.delete()
+        glDeleteTextures([self.tex])
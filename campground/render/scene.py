@@ -0,0 +1,155 @@
+import sys
+from OpenGL.GL import *
+from OpenGL.GLU import *
+from pyglm import glm
+from campground.culling import Culler, LodPicker
+from campground.loader import SceneLoader
+from campground import tree
+from campground.lsystem import LSystem
+from campground.meshes import tree_lods
+from campground.scene import plant
+from campground.render.camp import CampRenderer, fire_light
+from campground.render.forest import Forest
+from campground.render.glstate import state as gls
+from campground.render.meshcache import MeshCache
+from campground.render.particles import SmokeRenderer
+from campground.render.shading import ClusteredShading
+from campground.render.sky import SkyRenderer
+from campground.render.terrain import Terrain
+from campground.render.weather import WeatherRenderer
+
+s_width, s_height = 800, 600
+fov = 45.0
+z_near, z_far = 0.1, 100.0
+lod_dist = (10.0, 35.0)
+
+def draw_smoke(smoke, smoke_r):
+    if len(smoke) == 0:
+        return
+    gls.enable(GL_BLEND)
+    gls.blend_func(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+    smoke_r.draw_emitter(smoke)
+
+def gl_modules():
+    # Every module that calls GL, for instrument_gl
+    from campground.render import camp, forest, glstate, particles, shading, sky, terrain, weather
+    return [sys.modules[__name__], camp, forest, glstate, particles, shading, sky, terrain, weather]
+
+def grow_forest(sim):
+    # Worker side of the tree stage: placement (or the snapshot's transforms), L-system
+    # meshes and bounds, no GL
+    grid, transforms = plant(sim)
+    forest = Forest(transforms, tree_lods(LSystem(tree.axiom, tree.rules, tree.iterations)))
+    forest.bounds()
+    return grid, forest
+
+class SceneRenderer:
+    # Terrain chunks, trees and camp meshes are built on a SceneLoader's workers. With
+    # progressive=True the constructor returns before they land and render() uploads a
+    # budget's worth per frame, drawing whatever has arrived; otherwise it waits for all of it.
+    # shaders="vertex" or "pixel" lights through ClusteredShading at that rate, when the context
+    # can run it; otherwise (and by default) lighting is fixed function.
+    def __init__(self, cam, sim, size=(s_width, s_height), progressive=False, loader=None, shaders=None):
+        self.cam = cam
+        gls.invalidate()
+        for cap in (GL_DEPTH_TEST, GL_LIGHTING, GL_LIGHT0, GL_COLOR_MATERIAL, GL_NORMALIZE, GL_BLEND):
+            gls.enable(cap)
+        gls.blend_func(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        glMatrixMode(GL_PROJECTION)
+        glLoadIdentity()
+        gluPerspective(fov, size[0]/size[1], z_near, z_far)
+        glMatrixMode(GL_MODELVIEW)
+
+        self.loader = loader or SceneLoader()
+        # Trees first: placement is the longest single job and everything else fits around it
+        self.forest = self.tree_grid = None
+        self.loader.submit("trees.place", grow_forest, self.plant, sim)
+        self.terra = Terrain(sim.ground, loader=self.loader)
+        self.terra.update(cam.position, budget=1 << 30)
+        self.proj = glm.perspective(glm.radians(fov), size[0]/size[1], z_near, z_far)
+        self.culler = Culler(LodPicker(lod_dist))
+        self.sky_r = SkyRenderer()
+        self.weather_r = WeatherRenderer()
+        self.smoke_r = SmokeRenderer()
+        self.props = MeshCache()
+        self.camps = CampRenderer(sim.sites, self.props)
+        self.shading = None
+        if shaders:
+            try:
+                self.shading = ClusteredShading(size, fov, z_near, z_far, fire_light, per_pixel=shaders == "pixel")
+            except RuntimeError as e:
+                print("shaders unavailable, using fixed function: %s" % e, file=sys.stderr)
+        for _, forest, _ in self.camps.layers:
+            self.stream(forest, "camps")
+        if not progressive:
+            self.loader.finish()
+
+    def stream(self, forest, stage):
+        # One loader job per LOD layer: bake on a worker, upload on the GL thread
+        if len(forest) == 0: return
+        forest.reserve()
+        for level in range(len(forest.lods)):
+            self.loader.submit(stage, forest.level_data, lambda data, level=level: forest.upload_level(level, data), level)
+
+    def plant(self, placed):
+        self.tree_grid, forest = placed
+        self.tree_c, self.tree_r = forest.bounds()
+        self.tree_span = (float(self.tree_c[:, 1].min()), float(self.tree_c[:, 1].max())) if len(forest) else (0.0, 0.0)
+        self.tree_pad = float(self.tree_r.max()) if len(forest) else 0.0
+        self.stream(forest, "trees.bake")
+        self.forest = forest
+
+    def render(self, sim):
+        cam, culler, day, prof = self.cam, self.culler, sim.day, sim.profiler
+        gls.begin_frame()
+        with prof.scope("render.upload"):
+            self.loader.pump()
+        self.sky_r.apply_sky(day)
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        view = cam.view_data()
+        gls.load_view(view)
+        culler.begin_frame(self.proj * cam.view_matrix(), cam.position)
+        shading = self.shading
+        if shading is None:
+            self.camps.apply_lights(cam.position, not sim.is_day)
+        else:
+            with prof.scope("render.lights"):
+                shading.update(view, day.state, sim.weather, self.camps.fire_lights(not sim.is_day))
+            prof.count("light_refs", shading.stats["refs"])
+        with prof.scope("render.sky"):
+            if shading is None:
+                self.sky_r.apply(day, sim.weather)
+            self.sky_r.render(day, culler.visible("sun", day.sun_pos, day.sun_size),
+                              culler.visible("moon", day.moon_pos, day.sun_size))
+            # Sky discs are unlit; everything after them is shaded
+            if shading is not None:
+                shading.begin()
+            self.terra.update(cam.position)
+            self.terra.render(culler)
+        if self.forest is not None:
+            with prof.scope("render.cull"):
+                ids = self.tree_grid.query_frustum(culler.planes, self.tree_span, pad=self.tree_pad)
+                by_lod = culler.cull("trees", ids, self.tree_c[ids], self.tree_r[ids], total=len(self.forest))
+            with prof.scope("render.trees"):
+                self.forest.render(by_lod)
+        with prof.scope("render.props"):
+            self.camps.render(culler)
+        with prof.scope("weather.render"):
+            self.weather_r.render(sim.weather)
+        with prof.scope("smoke.render"):
+            draw_smoke(sim.smoke, self.smoke_r)
+        if shading is not None:
+            shading.end()
+        prof.count("gl_elided", gls.end_frame()["elided"])
+
+    def delete(self):
+        self.loader.shutdown()
+        if self.shading is not None:
+            self.shading.delete()
+        self.smoke_r.delete()
+        self.weather_r.delete()
+        self.sky_r.delete()
+        if self.forest is not None:
+            self.forest.delete()
+        self.terra.delete()
+        self.camps.delete()
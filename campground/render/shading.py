@@ -0,0 +1,273 @@
+import math
+import numpy as np
+from OpenGL.GL import *
+from OpenGL.GL.shaders import compileShader
+from campground.render.glstate import state as gls
+from campground.render.particles import StreamBuffer
+from campground.render.sky import frame_ambient
+
+# Lighting for everything the fixed-function path lights: the sun (or moon), global ambient
+# (the lightning flash while one lasts), any number of campfires, and exp2 fog per pixel. Rain
+# and smoke go through it too, so they pick up the fires and the fog like everything else. The
+# compatibility profile keeps the existing client arrays and matrix stack working under it.
+# Fires are assigned to a froxel grid on the CPU each frame: tiles across the screen times
+# exponential depth slices. Each vertex (or, with per_pixel, each fragment) walks only its own
+# cluster's list. Per vertex is the default: on llvmpipe it costs about what fixed function
+# does, where per pixel runs two to three times slower under the forest's overdraw.
+glsl_version = (3, 3)
+
+common_src = """
+#version 330 compatibility
+#define MAX_LIGHTS %d
+%s
+layout(std140) uniform Frame {
+    vec4 sun_dir;       // eye space
+    vec4 sun_diffuse;
+    vec4 ambient;       // global ambient, or the lightning flash in its place
+    vec4 fog_color;     // rgb, density
+    vec4 fire_diffuse;
+    vec4 fire_ambient;
+    vec4 fire_atten;    // constant, linear, quadratic, 1 / range^2
+    vec4 grid;          // tiles x, tiles y, depth slices, nearest light (-1 when none are lit)
+    vec4 screen;        // width, height, slice scale, slice bias
+    vec4 lights[MAX_LIGHTS];
+};
+uniform usamplerBuffer clusters;  // offset and count into `indices` per cluster
+uniform usamplerBuffer indices;
+
+float falloff(float r2, float r) {
+    // Fixed-function attenuation, windowed to zero at the range the clusters were built with
+    float x = r2 * fire_atten.w;
+    float w = clamp(1.0 - x * x, 0.0, 1.0);
+    return w * w / (fire_atten.x + fire_atten.y * r + fire_atten.z * r2);
+}
+
+vec3 lighting(vec3 pos, vec3 n, vec2 uv) {
+    // pos and n in eye space, uv the screen position in [0, 1]
+    vec3 light = ambient.rgb + sun_diffuse.rgb * max(dot(n, sun_dir.xyz), 0.0);
+    int near = int(grid.w);
+    if (near < 0)
+        return light;
+    ivec3 g = ivec3(grid.xyz);
+    int slice = clamp(int(log(max(-pos.z, 1e-4)) * screen.z + screen.w), 0, g.z - 1);
+    ivec2 tile = clamp(ivec2(uv * vec2(g.xy)), ivec2(0), g.xy - 1);
+    uvec2 span = texelFetch(clusters, (slice * g.y + tile.y) * g.x + tile.x).rg;
+    vec3 fire = vec3(0.0);
+    for (uint i = 0u; i < span.y; i++) {
+        vec3 d = lights[texelFetch(indices, int(span.x + i)).r].xyz - pos;
+        float r2 = dot(d, d), inv = inversesqrt(r2);
+        fire += max(dot(n, d) * inv, 0.0) * falloff(r2, r2 * inv);
+    }
+    // Only the nearest fire adds ambient, as on the fixed-function path
+    vec3 d = lights[near].xyz - pos;
+    float r2 = dot(d, d);
+    return light + fire_diffuse.rgb * fire + fire_ambient.rgb * falloff(r2, sqrt(r2));
+}
+"""
+
+vertex_src = """
+out vec3 v_pos;
+out vec4 v_color;
+out vec2 v_uv;
+#ifdef PER_PIXEL
+out vec3 v_normal;
+#else
+out vec3 v_light;
+#endif
+void main() {
+    vec4 eye = gl_ModelViewMatrix * gl_Vertex;
+    v_pos = eye.xyz;
+    v_color = gl_Color;
+    v_uv = gl_MultiTexCoord0.xy;
+    gl_Position = gl_ProjectionMatrix * eye;
+    vec3 n = gl_NormalMatrix * gl_Normal;
+#ifdef PER_PIXEL
+    v_normal = n;
+#else
+    v_light = lighting(v_pos, normalize(n), gl_Position.xy / max(gl_Position.w, 1e-4) * 0.5 + 0.5);
+#endif
+}
+"""
+
+fragment_src = """
+in vec3 v_pos;
+in vec4 v_color;
+in vec2 v_uv;
+#ifdef PER_PIXEL
+in vec3 v_normal;
+#else
+in vec3 v_light;
+#endif
+out vec4 frag;
+uniform sampler2D tex;  // smoke puffs; with no texture bound this reads alpha 1
+void main() {
+#ifdef PER_PIXEL
+    vec3 light = lighting(v_pos, normalize(v_normal), gl_FragCoord.xy / screen.xy);
+#else
+    vec3 light = v_light;
+#endif
+    vec3 color = min(v_color.rgb * light, 1.0);
+    float dist = fog_color.a * length(v_pos);
+    frag = vec4(mix(fog_color.rgb, color, exp(-dist * dist)), v_color.a * texture(tex, v_uv).a);
+}
+"""
+
+header = 9
+fog_color = (0.5, 0.5, 0.5)
+
+def supported():
+    # The context has to be new enough for the compatibility-profile shaders above
+    version = glGetString(GL_VERSION)
+    if not version:
+        return False
+    major, minor = (int(v) for v in version.split()[0].split(b".")[:2])
+    return (major, minor) >= glsl_version
+
+def _link(*shaders):
+    prog = glCreateProgram()
+    for s in shaders:
+        glAttachShader(prog, s)
+    glLinkProgram(prog)
+    for s in shaders:
+        glDeleteShader(s)
+    if not glGetProgramiv(prog, GL_LINK_STATUS):
+        log = glGetProgramInfoLog(prog)
+        glDeleteProgram(prog)
+        raise RuntimeError("shader link failed: %s" % log)
+    return prog
+
+def assign(lights, radius, tan_x, tan_y, near, far, grid):
+    # Cluster each eye-space light sphere overlaps. The tile range on each screen axis comes
+    # from the planes through the eye tangent to the sphere, so it is exact rather than a box
+    # around the projected corners. Returns (offset, count) per cluster and the light lists.
+    gx, gy, gz = grid
+    n = len(lights)
+    depth = -lights[:, 2]
+
+    def span(u, tan_half, tiles):
+        d = np.hypot(u, depth)
+        half = np.arcsin(np.minimum(radius / np.maximum(d, 1e-6), 1.0))
+        phi = np.arctan2(u, depth)
+        lim = 0.5 * math.pi - 1e-4
+        lo = np.tan(np.clip(phi - half, -lim, lim)) / tan_half
+        hi = np.tan(np.clip(phi + half, -lim, lim)) / tan_half
+        # An eye inside the sphere sees it in every direction
+        inside = d <= radius
+        lo[inside], hi[inside] = -1.0, 1.0
+        seen = (hi >= -1.0) & (lo <= 1.0)
+        a = np.clip(((lo + 1.0) * 0.5 * tiles).astype(np.int64), 0, tiles - 1)
+        b = np.clip(((hi + 1.0) * 0.5 * tiles).astype(np.int64), 0, tiles - 1)
+        return a, b, seen
+
+    x0, x1, sx = span(lights[:, 0], tan_x, gx)
+    y0, y1, sy = span(lights[:, 1], tan_y, gy)
+    scale = gz / math.log(far / near)
+    z0 = np.clip((np.log(np.maximum(depth - radius, near)) - math.log(near)) * scale, 0, gz - 1).astype(np.int64)
+    z1 = np.clip((np.log(np.maximum(depth + radius, near)) - math.log(near)) * scale, 0, gz - 1).astype(np.int64)
+    seen = sx & sy & (depth + radius >= near) & (depth - radius <= far)
+
+    nx, ny = x1 - x0 + 1, y1 - y0 + 1
+    counts = np.where(seen, nx * ny * (z1 - z0 + 1), 0)
+    total = int(counts.sum())
+    ids = np.repeat(np.arange(n), counts)
+    local = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    kz, rest = np.divmod(local, (nx * ny)[ids])
+    ky, kx = np.divmod(rest, nx[ids])
+    cluster = ((z0[ids] + kz) * gy + y0[ids] + ky) * gx + x0[ids] + kx
+    order = np.argsort(cluster, kind="stable")
+    count = np.bincount(cluster, minlength=gx * gy * gz)
+    table = np.column_stack([np.cumsum(count) - count, count]).astype(np.uint32)
+    return table, ids[order].astype(np.uint32)
+
+class ClusteredShading:
+    # One program for all lit geometry. update() once a frame with the view loaded, then
+    # begin()/end() around the draws it should shade. Raises RuntimeError when the context
+    # can't run it, so callers can stay on the fixed-function path.
+    def __init__(self, size, fov, near, far, fire, grid=(16, 9, 24), max_lights=512, per_pixel=False):
+        if not supported():
+            version = (glGetString(GL_VERSION) or b"?").decode()
+            raise RuntimeError("GL %s is older than %d.%d" % (version, *glsl_version))
+        common = common_src % (max_lights, "#define PER_PIXEL" if per_pixel else "")
+        self.prog = _link(compileShader(common + vertex_src, GL_VERTEX_SHADER),
+                          compileShader(common + fragment_src, GL_FRAGMENT_SHADER))
+        self.near   = near
+        self.far    = far
+        self.grid   = grid
+        self.fire   = fire
+        self.max_lights = max_lights
+        self.tan_y  = math.tan(math.radians(fov) * 0.5)
+        self.tan_x  = self.tan_y * size[0] / size[1]
+        self.stats  = {"lights": 0, "refs": 0}
+
+        self.block = np.zeros((header + max_lights, 4), dtype=np.float32)
+        self.ubo = glGenBuffers(1)
+        glBindBuffer(GL_UNIFORM_BUFFER, self.ubo)
+        glBufferData(GL_UNIFORM_BUFFER, self.block.nbytes, None, GL_DYNAMIC_DRAW)
+        glBindBuffer(GL_UNIFORM_BUFFER, 0)
+        glUniformBlockBinding(self.prog, glGetUniformBlockIndex(self.prog, "Frame"), 0)
+        # Cluster table and light lists are texture buffers on units 1 and 2
+        self.bufs = [StreamBuffer(GL_TEXTURE_BUFFER), StreamBuffer(GL_TEXTURE_BUFFER)]
+        self.texs = glGenTextures(2)
+        gls.use_program(self.prog)
+        for unit, (name, fmt, buf, tex) in enumerate(zip(("clusters", "indices"), (GL_RG32UI, GL_R32UI),
+                                                         self.bufs, self.texs), 1):
+            buf.upload(np.zeros(2, dtype=np.uint32))
+            glBindTexture(GL_TEXTURE_BUFFER, tex)
+            glTexBuffer(GL_TEXTURE_BUFFER, fmt, buf.vbo)
+            glUniform1i(glGetUniformLocation(self.prog, name), unit)
+        glBindTexture(GL_TEXTURE_BUFFER, 0)
+        glBindBuffer(GL_TEXTURE_BUFFER, 0)
+        gls.use_program(0)
+
+        b, (c, l, q), r = self.block, fire["attenuation"], fire["range"]
+        b[4], b[5], b[6] = fire["diffuse"], fire["ambient"], (c, l, q, 1.0 / (r * r))
+        scale = grid[2] / math.log(far / near)
+        b[8] = (size[0], size[1], scale, -math.log(near) * scale)
+
+    def update(self, view, day, weather, fires):
+        # view: column-major floats as glLoadMatrixf takes them; day: a DayNightCycle state;
+        # fires: world positions of the fires to light with
+        m = np.asarray(view, dtype=np.float32).reshape(4, 4)
+        b = self.block
+        sun = np.asarray(day["light"][:3], dtype=np.float32) @ m[:3, :3]
+        b[0, :3] = sun / max(float(np.linalg.norm(sun)), 1e-6)
+        b[1] = day["diffuse"]
+        # The same ambient SkyRenderer.apply sets for the fixed path, before any geometry
+        b[2] = frame_ambient(day, weather)
+        b[3] = fog_color + (weather.fog_density,)
+
+        # Nearest first: past max_lights the farthest are dropped, and only the nearest adds
+        # ambient, as on the fixed-function path
+        eye = np.asarray(fires, dtype=np.float32).reshape(-1, 3) @ m[:3, :3] + m[3, :3]
+        eye = eye[np.argsort(np.einsum("ij,ij->i", eye, eye), kind="stable")[:self.max_lights]]
+        n = len(eye)
+        b[7] = self.grid + (0 if n else -1,)
+        b[header:header + n, :3] = eye
+        table, lists = assign(eye, self.fire["range"], self.tan_x, self.tan_y, self.near, self.far, self.grid)
+        self.stats["lights"], self.stats["refs"] = n, len(lists)
+
+        glBindBuffer(GL_UNIFORM_BUFFER, self.ubo)
+        glBufferSubData(GL_UNIFORM_BUFFER, 0, (header + n) * 16, b)
+        glBindBuffer(GL_UNIFORM_BUFFER, 0)
+        self.bufs[0].upload(table)
+        # Never empty: a zero-sized buffer texture is incomplete on some drivers
+        self.bufs[1].upload(lists if len(lists) else np.zeros(1, dtype=np.uint32))
+        glBindBuffer(GL_TEXTURE_BUFFER, 0)
+
+    def begin(self):
+        gls.use_program(self.prog)
+        glBindBufferBase(GL_UNIFORM_BUFFER, 0, self.ubo)
+        for unit, tex in enumerate(self.texs, 1):
+            glActiveTexture(GL_TEXTURE0 + unit)
+            glBindTexture(GL_TEXTURE_BUFFER, tex)
+        glActiveTexture(GL_TEXTURE0)
+
+    def end(self):
+        gls.use_program(0)
+
+    def delete(self):
+        glDeleteTextures(list(self.texs))
+        for buf in self.bufs:
+            buf.delete()
+        glDeleteBuffers(1, [self.ubo])
+        glDeleteProgram(self.prog)
@@ -0,0 +1,64 @@
+from OpenGL.GL import *
+from OpenGL.GLU import *
+from campground.render.glstate import state as gls
+
+def frame_ambient(state, weather=None):
+    # Global ambient for the whole frame from a DayNightCycle state: a lightning flash replaces
+    # the table's value. Both lighting paths take it from here.
+    if weather is not None and weather.lightning_active:
+        i = weather.lightning_intensity
+        return (i, i, i, 1.0)
+    return state["ambient"]
+
+class SkyRenderer:
+    # Sky colour, sun light and the sun and moon discs of a DayNightCycle
+    def __init__(self):
+        self.sun_dl = None
+
+    def _make_disc(self, size):
+        dl = glGenLists(1)
+        glNewList(dl, GL_COMPILE)
+        quad = gluNewQuadric()
+        gluSphere(quad, size, 20, 20)
+        gluDeleteQuadric(quad)
+        glEndList()
+        return dl
+
+    def apply_sky(self, day):
+        # Before the clear, so this frame's sky colour is the one cleared to
+        gls.clear_color(day.state["sky"])
+
+    def apply(self, day, weather=None):
+        # Call with the view loaded and before any lit geometry; unchanged values are dropped
+        # by the state cache
+        st = day.state
+        gls.light_position(GL_LIGHT0, st["light"])
+        gls.light(GL_LIGHT0, GL_DIFFUSE, st["diffuse"])
+        gls.light(GL_LIGHT0, GL_SPECULAR, st["diffuse"])
+        gls.light_model(GL_LIGHT_MODEL_AMBIENT, frame_ambient(st, weather))
+
+    def _render_disc(self, day, pos, color, scale):
+        glColor3f(*color)
+        glPushMatrix()
+        glTranslatef(*pos)
+        glScalef(scale, scale, scale)
+        if self.sun_dl is None:
+            self.sun_dl = self._make_disc(day.sun_size)
+        glCallList(self.sun_dl)
+        glPopMatrix()
+
+    def render(self, day, sun=True, moon=True):
+        # Sun and moon are unlit; draw whichever is up inside one lighting toggle
+        sun, moon = sun and day.sun_pos[1] > 0, moon and day.moon_pos[1] > 0
+        if not (sun or moon): return
+        gls.disable(GL_LIGHTING)
+        if sun:
+            self._render_disc(day, day.sun_pos, day.state["sun_color"], 1.0)
+        if moon:
+            self._render_disc(day, day.moon_pos, (0.8, 0.8, 0.9), 0.6)
+        gls.enable(GL_LIGHTING)
+
+    def delete(self):
+        if self.sun_dl is not None:
+            glDeleteLists(self.sun_dl, 1)
+            self.sun_dl = None
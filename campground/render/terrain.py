@@ -0,0 +1,153 @@
+import ctypes
+import math
+import numpy as np
+from OpenGL.GL import *
+from campground.culling import LodPicker
+from campground.heightmap import chunk_mesh
+from campground.meshes import _grid_indices
+
+def _skirt_indices(n, step, skirt0):
+    # Curtain hanging from each chunk edge, hiding the cracks where neighbours differ in LOD
+    k = np.arange(0, n + 1, step)
+    edges = [k, n * (n + 1) + k, k * (n + 1), k * (n + 1) + n]
+    out = []
+    for e, edge in enumerate(edges):
+        s = skirt0 + e * (n + 1) + k
+        top, bot = edge[:-1], s[:-1]
+        top1, bot1 = edge[1:], s[1:]
+        out.append(np.stack([top, bot, top1, top1, bot, bot1], axis=-1).ravel())
+    return np.concatenate(out)
+
+def _lod_indices(n, step):
+    # Grid triangles using every `step`-th vertex of the full (n+1)^2 grid
+    m = n // step
+    g = _grid_indices(m, m)
+    r, c = np.divmod(g, m + 1)
+    return (r * step * (n + 1) + c * step).astype(np.uint32)
+
+class TerrainChunk:
+    def __init__(self, key, verts, norms, centre, radius, indices):
+        self.key    = key
+        self.centre = centre
+        self.radius = radius
+        self.vbo    = glGenBuffers(1)
+        self.ibos   = glGenBuffers(len(indices)) if len(indices) > 1 else [glGenBuffers(1)]
+        self.counts = [len(i) for i in indices]
+        self.norm_off = verts.nbytes
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferData(GL_ARRAY_BUFFER, verts.nbytes + norms.nbytes, None, GL_STATIC_DRAW)
+        glBufferSubData(GL_ARRAY_BUFFER, 0, verts.nbytes, verts)
+        glBufferSubData(GL_ARRAY_BUFFER, verts.nbytes, norms.nbytes, norms)
+        for ibo, idx in zip(self.ibos, indices):
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ibo)
+            glBufferData(GL_ELEMENT_ARRAY_BUFFER, idx.nbytes, idx, GL_STATIC_DRAW)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def draw(self, level):
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glVertexPointer(3, GL_FLOAT, 0, None)
+        glNormalPointer(GL_FLOAT, 0, ctypes.c_void_p(self.norm_off))
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.ibos[level])
+        glDrawElements(GL_TRIANGLES, self.counts[level], GL_UNSIGNED_INT, None)
+
+    def delete(self):
+        glDeleteBuffers(1, [self.vbo])
+        glDeleteBuffers(len(self.ibos), list(self.ibos))
+
+class Terrain:
+    # Square chunks of `res` cells streamed in around the camera. Every chunk holds its
+    # full-detail vertices once; each LOD is just a sparser index buffer over them. With a
+    # loader, chunk meshes are built on its workers and uploaded as they arrive.
+    def __init__(self, heightmap, chunk=32, res=32, view=110.0, lod_dist=(40.0, 70.0, 100.0),
+                 budget=4, color=(0.3, 0.5, 0.2), loader=None):
+        self.heightmap = heightmap
+        self.chunk   = float(chunk)
+        self.res     = res
+        self.view    = view
+        self.lod     = LodPicker(lod_dist)
+        self.budget  = budget
+        self.color   = color
+        self.chunks  = {}
+        self.loader  = loader
+        self.pending = set()
+        self.steps   = [min(1 << k, res) for k in range(self.lod.levels)]
+        skirt0 = (res + 1) ** 2
+        self.indices = [np.concatenate([_lod_indices(res, s), _skirt_indices(res, s, skirt0)]).astype(np.uint32)
+                        for s in self.steps]
+        self.stats   = {"loaded": 0, "unloaded": 0}
+
+    def __len__(self):
+        return len(self.chunks)
+
+    def build(self, key):
+        return chunk_mesh(self.heightmap, key, self.chunk, self.res)
+
+    def wanted(self, eye):
+        # Chunk keys within `view` of the eye on the ground plane, nearest first
+        c, r = self.chunk, int(math.ceil(self.view / self.chunk))
+        cx, cz = int(math.floor(eye[0] / c)), int(math.floor(eye[2] / c))
+        kx, kz = np.meshgrid(np.arange(cx - r, cx + r + 1), np.arange(cz - r, cz + r + 1))
+        kx, kz = kx.ravel(), kz.ravel()
+        # Distance from the eye to the nearest point of each chunk
+        dx = np.maximum(np.maximum(kx * c - eye[0], eye[0] - (kx + 1) * c), 0.0)
+        dz = np.maximum(np.maximum(kz * c - eye[2], eye[2] - (kz + 1) * c), 0.0)
+        d = np.hypot(dx, dz)
+        order = np.argsort(d, kind="stable")
+        keep = order[d[order] <= self.view]
+        return list(zip(kx[keep].tolist(), kz[keep].tolist()))
+
+    def update(self, eye, budget=None):
+        # Unload chunks a chunk-width past the view distance (so walking along an edge doesn't
+        # thrash), then build at most `budget` missing ones, nearest first. With a loader the
+        # budget caps builds in flight instead.
+        budget = self.budget if budget is None else budget
+        wanted = self.wanted(eye)
+        c = self.chunk
+        far = self.view + c
+        for key in list(self.chunks):
+            cx, cz = (key[0] + 0.5) * c, (key[1] + 0.5) * c
+            if math.hypot(cx - eye[0], cz - eye[2]) - c * 0.7072 > far:
+                self.chunks.pop(key).delete()
+                self.stats["unloaded"] += 1
+        built = len(self.pending)
+        for key in wanted:
+            if key in self.chunks or key in self.pending: continue
+            if built >= budget: break
+            if self.loader is None:
+                self.add(key, self.build(key))
+            else:
+                self.pending.add(key)
+                self.loader.submit("terrain", self.build, lambda mesh, key=key: self.add(key, mesh), key)
+            built += 1
+
+    def add(self, key, mesh):
+        self.pending.discard(key)
+        if key in self.chunks: return
+        self.chunks[key] = TerrainChunk(key, *mesh, self.indices)
+        self.stats["loaded"] += 1
+
+    def height_at(self, x, z):
+        return self.heightmap.height_at(x, z)
+
+    def render(self, culler):
+        chunks = list(self.chunks.values())
+        if not chunks: return
+        centres = np.array([ch.centre for ch in chunks])
+        radii = np.array([ch.radius for ch in chunks])
+        by_level = culler.cull("terrain", np.arange(len(chunks)), centres, radii, lod=self.lod)
+        glColor3f(*self.color)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_NORMAL_ARRAY)
+        for level, ids in enumerate(by_level):
+            for i in ids.tolist():
+                chunks[i].draw(level)
+        glDisableClientState(GL_NORMAL_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def delete(self):
+        for ch in self.chunks.values():
+            ch.delete()
+        self.chunks = {}
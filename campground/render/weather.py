@@ -0,0 +1,27 @@
+from OpenGL.GL import *
+from campground.render.glstate import state as gls
+from campground.render.particles import RainRenderer
+
+class WeatherRenderer:
+    # Fog and rain streaks of a WeatherSystem; the lightning flash is in the frame's ambient,
+    # set by SkyRenderer.apply
+    def __init__(self):
+        self.rain = RainRenderer()
+
+    def render(self, weather):
+        # Fog. A shader ignores it, but the unlit sky discs drawn outside one still need it
+        if weather.fog_density > 0:
+            gls.fog(GL_FOG_MODE, GL_EXP2)
+            gls.fog(GL_FOG_COLOR, (0.5,0.5,0.5,1.0))
+            gls.fog(GL_FOG_DENSITY, weather.fog_density)
+            gls.enable(GL_FOG)
+        else:
+            gls.disable(GL_FOG)
+
+        # Rain
+        rain, splash = weather.rain_particles, weather.splashes
+        self.rain.draw(rain.live(), rain.speed[:len(rain)], weather.wind)
+        self.rain.draw_splashes(splash.live(), splash.velocity())
+
+    def delete(self):
+        self.rain.delete()
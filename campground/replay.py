@@ -0,0 +1,66 @@
+import json
+import hashlib
+import numpy as np
+
+class FrameInput:
+    __slots__ = ("dt", "keys", "held", "mouse", "wheel")
+
+    def __init__(self, dt, keys=(), held=(), mouse=(), wheel=()):
+        self.dt    = dt
+        self.keys  = list(keys)
+        self.held  = list(held)
+        self.mouse = [tuple(m) for m in mouse]
+        self.wheel = list(wheel)
+
+    def to_dict(self):
+        d = {"dt": self.dt}
+        for k in ("keys", "held", "mouse", "wheel"):
+            if getattr(self, k):
+                d[k] = getattr(self, k)
+        return d
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d["dt"], d.get("keys", ()), d.get("held", ()), d.get("mouse", ()), d.get("wheel", ()))
+
+class HeldKeys:
+    # Stands in for pygame.key.get_pressed() when replaying
+    def __init__(self, held):
+        self.held = frozenset(held)
+
+    def __getitem__(self, key):
+        return key in self.held
+
+class InputRecorder:
+    def __init__(self, path, seed, step, options=None):
+        self.f = open(path, "w")
+        self.f.write(json.dumps({"version": 1, "seed": seed, "step": step, "options": options or {}}) + "\n")
+
+    def write(self, frame):
+        self.f.write(json.dumps(frame.to_dict()) + "\n")
+
+    def close(self):
+        self.f.close()
+
+class InputPlayer:
+    def __init__(self, path):
+        with open(path) as f:
+            self.header = json.loads(f.readline())
+            self.frames = [FrameInput.from_dict(json.loads(line)) for line in f if line.strip()]
+        if self.header.get("version") != 1:
+            raise ValueError("unsupported replay version: %r" % self.header.get("version"))
+        self.seed = self.header["seed"]
+        self.step = self.header["step"]
+        self.options = self.header.get("options", {})
+
+    def __iter__(self):
+        return iter(self.frames)
+
+    def __len__(self):
+        return len(self.frames)
+
+def digest(*parts):
+    h = hashlib.sha1()
+    for p in parts:
+        h.update(np.ascontiguousarray(p).tobytes() if isinstance(p, np.ndarray) else repr(p).encode())
+    return h.hexdigest()
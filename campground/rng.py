@@ -0,0 +1,14 @@
+import zlib
+import numpy as np
+
+class RngStreams:
+    # One independent Generator per named subsystem, all derived from a single seed
+    def __init__(self, seed=None):
+        self.seed = int(np.random.SeedSequence().entropy if seed is None else seed)
+        self._streams = {}
+
+    def __getitem__(self, name):
+        if name not in self._streams:
+            ss = np.random.SeedSequence(self.seed, spawn_key=(zlib.crc32(name.encode()),))
+            self._streams[name] = np.random.Generator(np.random.PCG64(ss))
+        return self._streams[name]
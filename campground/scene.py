@@ -0,0 +1,135 @@
+import os
+import numpy as np
+from campground.campsites import Campsites
+from campground.day_night_cycle import DayNightCycle
+from campground.heightmap import Heightmap
+from campground.keys import K_b, K_n, K_r, K_f, K_l
+from campground.particles import ParticleEmitter
+from campground.replay import HeldKeys, digest
+from campground.rng import RngStreams
+from campground.simulation import Simulation
+from campground.spatial import SpatialGrid, poisson_disk
+from campground.tree import Tree
+from campground import weather
+
+# Assembles the camp: ground, campsites, weather, smoke and trees. Nothing here touches GL.
+plot_h = 0.0
+flat_r = 8.0
+sites_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "configs", "campsites.json")
+eye_min = 1.0
+zoom = 1.0
+
+tree_count = 1000
+tent_buffer = 1.0
+pit_buffer = 0.5
+sp_rad = 60.0
+tree_spacing = 1.0
+tree_cell = 4.0
+
+s_rs = 1.0
+s_life = 3.0
+s_bh = 0.05
+s_bs = 0.1
+
+def make_smoke(rng, sites):
+    # One source per lit fire, all sharing a single ring buffer
+    smoke = ParticleEmitter(burst=4, every=0.1, life=s_life, rise=s_rs, spread=s_bs, rng=rng)
+    for x, y, z in sites.fire_points(s_bh).tolist():
+        smoke.add_source(x, y, z)
+    return smoke
+
+def make_simulation(step=1/60, seed=None, sites=sites_path):
+    rngs = RngStreams(seed)
+    ground = Heightmap(int(rngs["terrain"].integers(2**32)), base=plot_h, flat=flat_r)
+    camps = Campsites.load(sites)
+    camps.settle(ground)
+    return Simulation(weather.WeatherSystem(rng=rngs["weather"], ground=ground), DayNightCycle(), make_smoke(rngs["smoke"], camps),
+                      step=step, rngs=rngs, ground=ground, sites=camps)
+
+def place_trees(rng, count=tree_count, radius=sp_rad, ground=None, sites=None):
+    grid = SpatialGrid(tree_cell)
+    reject = sites.blocker(tent_buffer, pit_buffer) if sites is not None else None
+    grid.insert_many(poisson_disk(-radius, -radius, radius, radius, tree_spacing,
+                                  count=count, reject=reject, rng=rng))
+    pts = grid.positions()
+    ys = ground.height_at(pts[:, 0], pts[:, 1]).tolist() if ground is not None else [plot_h] * len(pts)
+    heights, yaws = rng.uniform(2, 4, len(pts)).tolist(), rng.uniform(0, 360, len(pts)).tolist()
+    return grid, [Tree((x, y, z), (1, h), (0, yaw), {})
+                  for (x, z), y, h, yaw in zip(pts.tolist(), ys, heights, yaws)]
+
+def plant(sim):
+    # The forest as a SpatialGrid plus Forest-column transforms, ids in the same order. A
+    # simulation loaded from a snapshot brings its transforms; otherwise they are placed from
+    # the "trees" stream once and kept on the simulation.
+    if sim.trees is None:
+        grid, trees = place_trees(sim.rngs["trees"], ground=sim.ground, sites=sim.sites)
+        sim.trees = np.array([t.transform() for t in trees], dtype=np.float32).reshape(-1, 6)
+        return grid, sim.trees
+    grid = SpatialGrid(tree_cell, capacity=max(len(sim.trees), 1))
+    grid.insert_many(sim.trees[:, [0, 2]])
+    return grid, sim.trees
+
+def handle_key(sim, key):
+    if key == K_b:
+        sim.is_day = True
+    elif key == K_n:
+        sim.is_day = False
+    elif key == K_r:
+        sim.weather.toggle_rain()
+    elif key == K_f:
+        sim.weather.toggle_fog()
+    elif key == K_l:
+        sim.weather.toggle_lightning()
+
+def apply_input(sim, cam, frame):
+    for key in frame.keys:
+        handle_key(sim, key)
+    with sim.profiler.scope("camera"):
+        for w in frame.wheel:
+            cam.zoom(zoom if w > 0 else -zoom)
+        for dx, dy in frame.mouse:
+            cam.process_mouse(dx, dy)
+        cam.process_keyboard(HeldKeys(frame.held), frame.dt)
+        if sim.ground is not None:
+            p = cam.position
+            p.y = max(p.y, float(sim.ground.height_at(p.x, p.z)) + eye_min)
+        sim.weather.follow(cam.position)
+    sim.advance(frame.dt)
+
+def state_digest(sim, cam):
+    rain = sim.weather.rain_particles
+    smoke = [a[s] for s in sim.smoke.segments() for a in (sim.smoke.pos, sim.smoke.age)]
+    return digest(sim.ticks, sim.strikes, rain.live(), rain.speed[:len(rain)],
+                  *smoke, tuple(cam.position), tuple(cam.front))
+
+def add_scene_args(ap):
+    ap.add_argument("--sites", default=sites_path, metavar="PATH", help="campsite config (JSON)")
+    ap.add_argument("--scene", metavar="PATH", help="start from a saved scene snapshot instead of --sites")
+    ap.add_argument("--weather", choices=sorted(weather.states), help="start in this weather")
+    ap.add_argument("--weather-cycle", action="store_true", help="let the weather change on its own")
+    ap.add_argument("--rain", action="store_true", help="same as --weather rain")
+    ap.add_argument("--lightning", action="store_true", help="same as --weather storm")
+    ap.add_argument("--fog", action="store_true")
+    ap.add_argument("--night", action="store_true")
+    ap.add_argument("--day-length", type=float, metavar="SECONDS",
+                    help="run a continuous day/night cycle of this length (0 holds noon or midnight)")
+    ap.add_argument("--time", type=float, metavar="HOURS", help="start at this time of day (6 is sunrise)")
+
+def apply_options(sim, args):
+    # Only what was asked for, so a loaded scene keeps the rest of its saved state
+    if args.day_length is not None:
+        sim.day.length = args.day_length
+    if args.time is not None:
+        sim.day.set_time((args.time - 6.0) / 24.0)
+    elif args.night:
+        sim.day.set_time(0.75)
+    sim.is_day = sim.day.mode == "day"
+    w = sim.weather
+    state = args.weather or ("storm" if args.lightning else "rain" if args.rain else None)
+    if state is not None:
+        w.auto = w.auto or args.weather_cycle
+        w.set_state(state, blend=0.0)
+    elif args.weather_cycle:
+        w.set_auto(True)
+    if args.fog and not w.mist:
+        w.toggle_fog(blend=0.0)
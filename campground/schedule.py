@@ -0,0 +1,44 @@
+import heapq
+
+class Scheduler:
+    # Named timers on a heap ordered by due time. Each name has at most one pending timer:
+    # scheduling it again replaces the old one, which is skipped when it reaches the top.
+    # Checking for due timers is a peek at the heap, so a quiet schedule costs nothing.
+    def __init__(self):
+        self.heap    = []
+        self.pending = {}
+        self.seq     = 0
+
+    def __len__(self):
+        return len(self.pending)
+
+    def at(self, time, name, arg=None):
+        self.seq += 1
+        self.pending[name] = (time, self.seq, arg)
+        heapq.heappush(self.heap, (time, self.seq, name))
+
+    def cancel(self, name):
+        self.pending.pop(name, None)
+
+    def due(self, now):
+        # (time, name, arg) of every timer at or before `now`, earliest first. Timers a caller
+        # schedules while iterating are picked up in the same pass if they are due too.
+        heap, pending = self.heap, self.pending
+        while heap and heap[0][0] <= now:
+            time, seq, name = heapq.heappop(heap)
+            p = pending.get(name)
+            if p is None or p[1] != seq: continue
+            del pending[name]
+            yield time, name, p[2]
+
+    def next_time(self):
+        # No later than the earliest pending timer (a replaced one may still sit on top)
+        return self.heap[0][0] if self.heap else float("inf")
+
+    def to_list(self):
+        return [[t, name, arg] for name, (t, seq, arg) in sorted(self.pending.items(), key=lambda kv: kv[1][1])]
+
+    def load(self, timers):
+        self.heap, self.pending = [], {}
+        for t, name, arg in timers:
+            self.at(t, name, arg)
@@ -0,0 +1,112 @@
+import time
+from campground.rng import RngStreams
+from campground.profiler import NullProfiler
+
+class FixedStepper:
+    def __init__(self, step=1/60, max_steps=8):
+        self.step      = step
+        self.max_steps = max_steps
+        self.acc       = 0.0
+
+    def advance(self, elapsed, tick):
+        self.acc += elapsed
+        n = 0
+        while self.acc >= self.step and n < self.max_steps:
+            tick(self.step)
+            self.acc -= self.step
+            n += 1
+        # Drop the backlog rather than spiral when a frame takes longer than max_steps ticks
+        if n == self.max_steps:
+            self.acc = min(self.acc, self.step)
+        return n
+
+class Simulation:
+    # Camp state advanced in fixed ticks; holds no GL or pygame objects
+    def __init__(self, weather, day, smoke=None, step=1/60, rngs=None, ground=None, sites=None):
+        self.rngs         = rngs or RngStreams()
+        self.weather      = weather
+        self.day          = day
+        self.smoke        = smoke
+        self.ground       = ground
+        self.sites        = sites
+        # Tree transforms in Forest columns; None until planted or loaded from a snapshot
+        self.trees        = None
+        self.is_day       = True
+        self.time         = 0.0
+        self.ticks        = 0
+        self.strikes      = 0
+        self.stepper      = FixedStepper(step)
+        self.profiler     = NullProfiler()
+
+    def tick(self, dt):
+        prof = self.profiler
+        struck = self.weather.strikes
+        with prof.scope("weather.update"):
+            self.weather.update(dt)
+        self.strikes += self.weather.strikes - struck
+        with prof.scope("day.update"):
+            self.is_day = self.day.update(dt, "day" if self.is_day else "night")
+        if self.smoke is not None:
+            with prof.scope("smoke.update"):
+                self.smoke.update(dt)
+        self.time  += dt
+        self.ticks += 1
+
+    def advance(self, elapsed):
+        return self.stepper.advance(elapsed, self.tick)
+
+    def idle(self):
+        # Only clocks would move: quiet weather, no smoke sources, a day held at noon or midnight
+        day, smoke = self.day, self.smoke
+        return (day.length == 0 and day.mode == ("day" if self.is_day else "night")
+                and (smoke is None or not len(smoke.sources) and not len(smoke))
+                and self.weather.quiet())
+
+    def coast(self, step, limit):
+        # Cross up to `limit` idle ticks at once, up to the next weather timer
+        n = self.weather.coast(step, limit)
+        t = self.time
+        for _ in range(n):
+            t += step
+        self.time   = t
+        self.ticks += n
+        return n
+
+    def run(self, ticks):
+        # Headless: each tick counts as one profiler frame. Unprofiled, idle stretches go
+        # event to event through coast(), ending where tick by tick would
+        step, prof = self.stepper.step, self.profiler
+        while ticks > 0:
+            if not prof.enabled and self.idle():
+                n = self.coast(step, ticks)
+                if n:
+                    ticks -= n
+                    continue
+            prof.begin_frame()
+            self.tick(step)
+            prof.end_frame()
+            ticks -= 1
+
+    def stats(self):
+        return {
+            "ticks":     self.ticks,
+            "sim_time":  self.time,
+            "rain":      len(self.weather.rain_particles),
+            "smoke":     len(self.smoke) if self.smoke is not None else 0,
+            "lightning": self.weather.lightning_active,
+            "strikes":   self.strikes,
+        }
+
+def run_headless(sim, ticks, report_every=0, out=print):
+    t0 = time.perf_counter()
+    done = 0
+    while done < ticks:
+        n = min(report_every or ticks, ticks - done)
+        sim.run(n)
+        done += n
+        if report_every:
+            out(sim.stats())
+    wall = time.perf_counter() - t0
+    summary = dict(sim.stats(), wall=wall, speedup=sim.time / wall if wall > 0 else float("inf"))
+    out(summary)
+    return summary
@@ -0,0 +1,64 @@
+import numpy as np
+
+# Time of day t runs over [0, 1): 0 is sunrise, 0.25 noon, 0.5 sunset, 0.75 midnight.
+# Colours are keyed on the sun's elevation (sin of its angle), so dawn and dusk match.
+sky_keys = [(-1.0,  (0.01, 0.01, 0.04)),
+            (-0.25, (0.03, 0.04, 0.10)),
+            (-0.05, (0.25, 0.20, 0.30)),
+            (0.0,   (0.85, 0.50, 0.30)),
+            (0.15,  (0.60, 0.70, 0.95)),
+            (1.0,   (0.50, 0.70, 1.00))]
+sun_keys = [(-0.05, (0.0, 0.0, 0.0)),
+            (0.0,   (0.9, 0.4, 0.2)),
+            (0.2,   (1.0, 0.9, 0.8)),
+            (0.4,   (1.0, 1.0, 1.0))]
+ambient_keys = [(-1.0,  (0.03, 0.03, 0.06)),
+                (-0.1,  (0.03, 0.03, 0.06)),
+                (0.05,  (0.35, 0.25, 0.20)),
+                (0.4,   (1.0, 1.0, 1.0))]
+sun_disc_keys = [(0.0, (1.0, 0.5, 0.2)), (0.25, (1.0, 1.0, 0.8))]
+moon_light = (0.05, 0.05, 0.1)
+orbit = 80.0
+
+# Column layout of a table row
+columns = {"light": slice(0, 4), "diffuse": slice(4, 8), "ambient": slice(8, 12), "sky": slice(12, 16),
+           "sun": slice(16, 19), "moon": slice(19, 22), "sun_color": slice(22, 25)}
+width = 25
+
+def gradient(x, keys):
+    # Piecewise-linear colour over sorted (x, rgb) keys, per channel
+    xs = [k for k, _ in keys]
+    rgb = np.array([c for _, c in keys])
+    return np.stack([np.interp(x, xs, rgb[:, i]) for i in range(3)], axis=-1)
+
+def sky_table(samples=256):
+    # Every lighting input for `samples` evenly spaced times of day, plus a wrap-around row
+    t = np.arange(samples + 1) / samples
+    a = 2 * np.pi * t
+    e, c = np.sin(a), np.cos(a)
+    rows = np.zeros((samples + 1, width))
+    one = np.ones((samples + 1, 1))
+    # The sun lights the scene while it's up, the moon (opposite it) once it's down
+    up = (e >= 0)[:, None]
+    sun_dir = np.stack([np.zeros_like(e), e, -c], axis=-1)
+    light = np.where(up, sun_dir, -sun_dir)
+    light[:, 1] = np.maximum(light[:, 1], 0.1)
+    moon = np.clip(-e / 0.3, 0.0, 1.0)[:, None] * np.array(moon_light)
+    diffuse = np.where(up, gradient(e, sun_keys), moon)
+    rows[:, columns["light"]] = np.hstack([light, 0 * one])
+    rows[:, columns["diffuse"]] = np.hstack([diffuse, one])
+    rows[:, columns["ambient"]] = np.hstack([gradient(e, ambient_keys), one])
+    rows[:, columns["sky"]] = np.hstack([gradient(e, sky_keys), one])
+    rows[:, columns["sun"]] = orbit * sun_dir
+    rows[:, columns["moon"]] = -orbit * sun_dir
+    rows[:, columns["sun_color"]] = gradient(e, sun_disc_keys)
+    return rows
+
+def lookup(table, t):
+    # Linear blend of the two rows around t, as plain floats
+    n = len(table) - 1
+    x = (t % 1.0) * n
+    i = min(int(x), n - 1)
+    f = x - i
+    row = (table[i] * (1.0 - f) + table[i + 1] * f).tolist()
+    return {k: tuple(row[s]) for k, s in columns.items()}
@@ -0,0 +1,161 @@
+import json
+import math
+import os
+import struct
+import numpy as np
+from campground.campsites import Campsites
+from campground.day_night_cycle import DayNightCycle
+from campground.heightmap import Heightmap
+from campground.rng import RngStreams
+from campground.scene import make_simulation, make_smoke, plant, sites_path
+from campground.simulation import Simulation
+from campground.weather import WeatherSystem
+
+# Scene file: 8-byte magic, u32 version, u32 header length, a JSON header, then every array
+# at a 64-byte boundary. The header holds the scalars and, per array, its dtype, shape and
+# offset from the start of the data, so loading maps the file once and views into it.
+magic   = b"CAMPSCN\0"
+version = 2
+align   = 64
+
+tile_size = 32.0
+tile_res  = 32
+tile_view = 110.0
+
+_site_cols = ("tents", "tent_yaw", "tent_size", "fires", "fire_radius", "lit", "tent_y", "fire_y")
+_terrain_params = ("seed", "amplitude", "scale", "octaves", "cell", "base", "flat", "blend")
+
+def _pad(n):
+    return -(-n // align) * align
+
+def write(path, arrays, meta=None):
+    arrays = {name: np.ascontiguousarray(a) for name, a in arrays.items()}
+    table, off = {}, 0
+    for name, a in arrays.items():
+        table[name] = {"dtype": a.dtype.str, "shape": list(a.shape), "offset": off}
+        off = _pad(off + a.nbytes)
+    head = json.dumps({"meta": meta or {}, "arrays": table}).encode()
+    base = _pad(16 + len(head))
+    with open(path, "wb") as f:
+        f.write(magic + struct.pack("<II", version, len(head)) + head)
+        for name, a in arrays.items():
+            f.seek(base + table[name]["offset"])
+            f.write(a.data)
+        f.truncate(base + off)
+
+def read(path):
+    # Arrays come back as read-only views of one memory map: nothing is copied until used
+    with open(path, "rb") as f:
+        pre = f.read(16)
+        if len(pre) < 16 or pre[:8] != magic:
+            raise ValueError("%s is not a scene snapshot" % path)
+        ver, n = struct.unpack("<II", pre[8:])
+        if ver > version:
+            raise ValueError("%s is snapshot version %d; this build reads up to %d" % (path, ver, version))
+        head = json.loads(f.read(n))
+    base = _pad(16 + n)
+    mm = np.memmap(path, dtype=np.uint8, mode="r")
+    arrays = {}
+    for name, t in head["arrays"].items():
+        shape = tuple(t["shape"])
+        arrays[name] = np.frombuffer(mm, dtype=np.dtype(t["dtype"]), count=math.prod(shape),
+                                     offset=base + t["offset"]).reshape(shape)
+    return arrays, head["meta"]
+
+def tile_keys(radius=tile_view, size=tile_size):
+    # Chunk keys whose nearest point lies within `radius` of the origin
+    r = int(math.ceil(radius / size))
+    kx, kz = np.meshgrid(np.arange(-r, r), np.arange(-r, r), indexing="ij")
+    dx = np.maximum(np.maximum(kx * size, -(kx + 1) * size), 0.0)
+    dz = np.maximum(np.maximum(kz * size, -(kz + 1) * size), 0.0)
+    keep = np.hypot(dx, dz) <= radius
+    return np.column_stack([kx[keep], kz[keep]]).astype(np.int32)
+
+def save_scene(path, sim, radius=tile_view):
+    # Trees (placed now if they haven't been), campsites, terrain chunks around the origin,
+    # weather with its rain, smoke and the clock: enough to resume the simulation exactly
+    trees = sim.trees if sim.trees is not None else plant(sim)[1]
+    ground, sites, w, smoke = sim.ground, sim.sites, sim.weather, sim.smoke
+    keys = tile_keys(radius)
+    arrays = {"trees": np.asarray(trees, dtype=np.float32)}
+    arrays.update({"site_" + c: getattr(sites, c) for c in _site_cols})
+    arrays["tile_keys"] = keys
+    arrays["tiles"] = np.array([ground.chunk_grid(k, tile_size, tile_res) for k in keys.tolist()]).reshape(
+        len(keys), tile_res + 3, tile_res + 3)
+    rain = w.rain_particles
+    arrays["rain_pos"], arrays["rain_speed"] = rain.live(), rain.speed[:len(rain)]
+    splash = w.splashes
+    arrays["splash_pos"], arrays["splash_vel"], arrays["splash_age"] = splash.live(), splash.velocity(), splash.age
+    # The whole smoke ring as laid out, so a resumed run wraps at the same places
+    arrays["smoke_base"] = smoke.base if smoke is not None else np.zeros((0, 3), np.float32)
+    arrays["smoke_born"] = smoke.born if smoke is not None else np.zeros(0)
+    meta = {
+        "seed":    sim.rngs.seed,
+        "terrain": {k: getattr(ground, k) for k in _terrain_params},
+        "tile":    [tile_size, tile_res],
+        "weather": dict(w.to_dict(), rain_cap=rain.capacity, rng=w.rng.bit_generator.state,
+                        center=w.center.tolist(), wind=w.wind.tolist()),
+        "smoke":   {"head": smoke.head, "count": smoke.count, "timer": smoke.timer, "clock": smoke.clock,
+                    "rng": smoke.rng.bit_generator.state} if smoke is not None else None,
+        "day":     {"length": sim.day.length, "time": sim.day.time},
+        "clock":   {"is_day": sim.is_day, "time": sim.time, "ticks": sim.ticks, "strikes": sim.strikes},
+    }
+    tmp = path + ".tmp"
+    write(tmp, arrays, meta)
+    os.replace(tmp, path)
+
+def load_scene(path, step=1/60, seed=None):
+    # A Simulation over the snapshot's arrays. Trees, campsites and terrain tiles stay mapped;
+    # only the rain and smoke pools, which the simulation writes to, are copied.
+    a, meta = read(path)
+    rngs = RngStreams(meta["seed"] if seed is None else seed)
+    ground = Heightmap(**meta["terrain"])
+    size, res = meta["tile"]
+    for key, tile in zip(a["tile_keys"].tolist(), a["tiles"]):
+        ground.tiles[(tuple(key), size, res)] = tile
+    sites = Campsites(*(a["site_" + c] for c in _site_cols[:6]))
+    sites.tent_y, sites.fire_y = a["site_tent_y"], a["site_fire_y"]
+
+    wm = meta["weather"]
+    weather = WeatherSystem(wm["rain_cap"], rng=rngs["weather"], ground=ground)
+    if "timers" in wm:
+        weather.load_dict({k: wm[k] for k in weather.to_dict()})
+    else:
+        # Version 1 kept on/off switches rather than a state and its timers
+        weather.mist = wm["fog_density"]
+        weather.set_state("storm" if wm["lightning_enabled"] else "rain" if wm["rain_enabled"] else "clear", blend=0.0)
+    weather.rng.bit_generator.state = wm["rng"]
+    rain, n = weather.rain_particles, len(a["rain_pos"])
+    rain.data[:3, :n], rain.speed[:n], rain.count = a["rain_pos"].T, a["rain_speed"], n
+    # Snapshots from before the rain followed the camera have no volume or splashes
+    weather.center[:] = wm.get("center", weather.center)
+    weather.wind[:] = wm.get("wind", weather.wind)
+    if "splash_age" in a:
+        splash, n = weather.splashes, len(a["splash_age"])
+        splash.data[:3, :n], splash.data[3:6, :n], splash.data[6, :n] = a["splash_pos"].T, a["splash_vel"].T, a["splash_age"]
+        splash.head, splash.count = 0, n
+
+    smoke, sm = make_smoke(rngs["smoke"], sites), meta["smoke"]
+    if sm is not None and "smoke_born" in a and len(a["smoke_born"]) == smoke.capacity:
+        smoke.base[:], smoke.born[:], smoke.clock = a["smoke_base"], a["smoke_born"], sm["clock"]
+    elif sm is not None and "smoke_age" in a and len(a["smoke_age"]) == smoke.capacity:
+        # Older snapshots stored each puff's position and age
+        smoke.load(a["smoke_pos"], a["smoke_age"])
+    else:
+        sm = None
+    if sm is not None:
+        smoke.head, smoke.count, smoke.timer = sm["head"], sm["count"], sm["timer"]
+        smoke.rng.bit_generator.state = sm["rng"]
+
+    day = DayNightCycle(meta["day"]["length"], meta["day"]["time"])
+    sim = Simulation(weather, day, smoke, step=step, rngs=rngs, ground=ground, sites=sites)
+    sim.trees = a["trees"]
+    clock = meta["clock"]
+    sim.is_day, sim.time, sim.ticks, sim.strikes = clock["is_day"], clock["time"], clock["ticks"], clock["strikes"]
+    return sim
+
+def open_simulation(step=1/60, seed=None, sites=sites_path, scene=None):
+    # A saved scene if there is one, otherwise a fresh camp from the campsite config
+    if scene:
+        return load_scene(scene, step, seed)
+    return make_simulation(step, seed, sites)
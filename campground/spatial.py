@@ -0,0 +1,162 @@
+import math
+import itertools
+import numpy as np
+
+class SpatialGrid:
+    # Uniform hash grid over the XZ plane; ids are insertion order
+    def __init__(self, cell=4.0, capacity=1024):
+        self.cell  = float(cell)
+        self.pos   = np.empty((capacity, 2), dtype=np.float32)
+        self.count = 0
+        self.cells = {}
+        self._keys = None
+
+    def __len__(self):
+        return self.count
+
+    def positions(self):
+        return self.pos[:self.count]
+
+    def _reserve(self, n):
+        if self.count + n > len(self.pos):
+            grown = np.empty((max(self.count + n, 2 * len(self.pos)), 2), dtype=np.float32)
+            grown[:self.count] = self.pos[:self.count]
+            self.pos = grown
+
+    def insert(self, x, z):
+        self._reserve(1)
+        i = self.count
+        self.pos[i] = (x, z)
+        self.count += 1
+        key = (math.floor(x / self.cell), math.floor(z / self.cell))
+        self.cells.setdefault(key, []).append(i)
+        self._keys = None
+        return i
+
+    def insert_many(self, xz):
+        xz = np.asarray(xz, dtype=np.float32).reshape(-1, 2)
+        n = len(xz)
+        self._reserve(n)
+        ids = np.arange(self.count, self.count + n)
+        self.pos[self.count:self.count + n] = xz
+        self.count += n
+        # Group by cell so each bucket is extended once
+        keys = np.floor(xz / self.cell).astype(np.int64)
+        order = np.lexsort((keys[:, 1], keys[:, 0]))
+        keys, ids_sorted = keys[order], ids[order]
+        starts = np.flatnonzero(np.r_[True, np.any(keys[1:] != keys[:-1], axis=1)])
+        bounds = np.r_[starts, n]
+        for k, a, b in zip(keys[starts].tolist(), bounds[:-1], bounds[1:]):
+            self.cells.setdefault(tuple(k), []).extend(ids_sorted[a:b].tolist())
+        self._keys = None
+        return ids
+
+    def _gather(self, keys):
+        lists = [self.cells[k] for k in keys if k in self.cells]
+        return np.fromiter(itertools.chain.from_iterable(lists), dtype=np.int64)
+
+    def _cell_range(self, x0, z0, x1, z1):
+        c = self.cell
+        i0, i1 = math.floor(x0 / c), math.floor(x1 / c)
+        j0, j1 = math.floor(z0 / c), math.floor(z1 / c)
+        if (i1 - i0 + 1) * (j1 - j0 + 1) > len(self.cells):
+            return [k for k in self.cells if i0 <= k[0] <= i1 and j0 <= k[1] <= j1]
+        return [(i, j) for i in range(i0, i1 + 1) for j in range(j0, j1 + 1)]
+
+    def query_aabb(self, x0, z0, x1, z1):
+        ids = self._gather(self._cell_range(x0, z0, x1, z1))
+        p = self.pos[ids]
+        inside = (p[:, 0] >= x0) & (p[:, 0] <= x1) & (p[:, 1] >= z0) & (p[:, 1] <= z1)
+        return ids[inside]
+
+    def query_radius(self, x, z, r):
+        ids = self._gather(self._cell_range(x - r, z - r, x + r, z + r))
+        d = self.pos[ids] - (x, z)
+        return ids[np.einsum("ij,ij->i", d, d) <= r * r]
+
+    def occupied_cells(self):
+        if self._keys is None:
+            self._keys = np.array(list(self.cells), dtype=np.int64).reshape(-1, 2)
+        return self._keys
+
+    def query_frustum(self, planes, y_range=(0.0, 6.0), pad=0.0):
+        # planes: (k, 4) with a*x + b*y + c*z + d >= 0 inside. Each point stands for spheres
+        # of radius <= pad centred anywhere in y_range above it; the result is conservative.
+        planes = np.asarray(planes, dtype=np.float64)
+        keys = self.occupied_cells()
+        if len(keys) == 0 or len(planes) == 0:
+            return np.zeros(0, dtype=np.int64)
+        lo = keys * self.cell - pad
+        hi = lo + self.cell + 2 * pad
+        # Positive vertex of each cell box per plane; cull the cell if it lies outside any plane
+        ylo, yhi = y_range[0] - pad, y_range[1] + pad
+        px = np.where(planes[:, 0] >= 0, hi[:, None, 0], lo[:, None, 0])
+        py = np.where(planes[:, 1] >= 0, yhi, ylo)
+        pz = np.where(planes[:, 2] >= 0, hi[:, None, 1], lo[:, None, 1])
+        dist = px * planes[:, 0] + py * planes[:, 1] + pz * planes[:, 2] + planes[:, 3]
+        keep = np.all(dist >= 0, axis=1)
+        ids = self._gather(map(tuple, keys[keep].tolist()))
+        # Then each point as a sphere around its vertical extent
+        p = self.pos[ids].astype(np.float64)
+        ymid, rad = (y_range[0] + y_range[1]) * 0.5, (y_range[1] - y_range[0]) * 0.5 + pad
+        dist = p[:, :1] * planes[:, 0] + ymid * planes[:, 1] + p[:, 1:] * planes[:, 2] + planes[:, 3]
+        return ids[np.all(dist >= -rad, axis=1)]
+
+# Neighbour offsets that can hold a point closer than r when cells are r/sqrt(2) wide
+_NEIGHBOURS = np.array([(i, j) for i in range(-2, 3) for j in range(-2, 3)
+                        if abs(i) + abs(j) < 4], dtype=np.int64)
+
+def poisson_disk(x0, z0, x1, z1, r, count=None, reject=None, rng=None, batch=None, tries=8):
+    # Vectorized dart throwing on a background grid holding at most one point per cell.
+    # Candidates are accepted in 9 phases by (cell mod 3): same-phase cells are >= 2 cells apart,
+    # so no two darts tested together can conflict. A cell that rejects `tries` darts is retired (-2),
+    # as in Bridson's k-attempt limit.
+    rng = rng or np.random.default_rng()
+    cs = r / math.sqrt(2.0)
+    nx, nz = max(1, math.ceil((x1 - x0) / cs)), max(1, math.ceil((z1 - z0) / cs))
+    grid = np.full((nx + 4, nz + 4), -1, dtype=np.int64)
+    cap = nx * nz if count is None else min(count, nx * nz)
+    pts = np.zeros((cap, 2), dtype=np.float64)
+    # Small batches: darts of one batch are resolved phase by phase, so the fewer that can
+    # conflict with each other, the less the first phase tested is favoured
+    batch = batch or max(64, nx * nz // 64)
+    fails = np.zeros_like(grid, dtype=np.int32)
+    n, r2 = 0, r * r
+    inner = grid[2:-2, 2:-2]
+    while n < cap:
+        # Throw darts only into cells that are still open, one per cell, and no more than the
+        # points still wanted: a batch that overshot would have to be cut off somewhere, and
+        # cutting by phase leaves whole lattice columns empty
+        free = np.flatnonzero(inner.ravel() == -1)
+        if len(free) == 0: break
+        cells = np.unique(free[rng.integers(0, len(free), min(batch, len(free), cap - n))])
+        ci = np.stack([cells // nz, cells % nz], axis=1)
+        cand = (ci + rng.uniform(0.0, 1.0, ci.shape)) * cs + (x0, z0)
+        keep = (cand[:, 0] < x1) & (cand[:, 1] < z1)
+        if reject is not None:
+            keep &= ~reject(cand[:, 0], cand[:, 1])
+        ci += 2
+        bad = ci[~keep]
+        fails[bad[:, 0], bad[:, 1]] += 1
+        cand, ci = cand[keep], ci[keep]
+        # Phases in a fresh order each batch, so no phase always wins the conflicts
+        phase = rng.permutation(9)[(ci[:, 0] % 3) * 3 + ci[:, 1] % 3]
+        order = np.argsort(phase, kind="stable")
+        cand, ci = cand[order], ci[order]
+        bounds = np.searchsorted(phase[order], np.arange(10))
+        for a, b in zip(bounds[:-1], bounds[1:]):
+            if a == b: continue
+            c, cc = cand[a:b], ci[a:b]
+            nb = grid[cc[:, 0, None] + _NEIGHBOURS[:, 0], cc[:, 1, None] + _NEIGHBOURS[:, 1]]
+            d = pts[np.maximum(nb, 0)] - c[:, None, :]
+            close = (nb >= 0) & (np.einsum("ijk,ijk->ij", d, d) < r2)
+            ok = ~close.any(axis=1)
+            bad = cc[~ok]
+            fails[bad[:, 0], bad[:, 1]] += 1
+            c, cc = c[ok], cc[ok]
+            k = len(c)
+            pts[n:n + k] = c
+            grid[cc[:, 0], cc[:, 1]] = np.arange(n, n + k)
+            n += k
+        grid[(fails >= tries) & (grid == -1)] = -2
+    return pts[:n]
@@ -0,0 +1,94 @@
+import argparse
+import sys
+import time
+from campground.camera import Camera
+from campground.profiler import Profiler
+from campground.render import offscreen
+from campground.scene import add_scene_args, apply_options
+from campground.snapshot import open_simulation
+
+def parse_size(text):
+    w, h = text.lower().split("x")
+    return int(w), int(h)
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m campground.timelapse", description="Render the scene offscreen to a PNG sequence or raw video stream")
+    ap.add_argument("out", help="frames/%%05d.png for PNGs; a path or - for raw RGBA; "
+                                "'|cmd' to pipe raw RGBA into cmd ({width} and {height} are filled in)")
+    ap.add_argument("--size", type=parse_size, default=(1280, 720), metavar="WxH")
+    ap.add_argument("--frames", type=int, default=600)
+    ap.add_argument("--every", type=int, default=1, metavar="TICKS", help="simulation ticks between frames")
+    ap.add_argument("--warmup", type=int, default=240, metavar="TICKS", help="ticks to run before the first frame")
+    ap.add_argument("--camera", default="0,2,10,-90,0", metavar="X,Y,Z,YAW,PITCH")
+    ap.add_argument("--pbos", type=int, default=2, help="pixel buffers in the readback ring")
+    ap.add_argument("--queue", type=int, default=8, help="frames the writer thread may fall behind by")
+    ap.add_argument("--level", type=int, default=6, help="PNG compression level")
+    ap.add_argument("--shaders", nargs="?", const="vertex", choices=("vertex", "pixel"),
+                    help="render with the GLSL lighting path, fires lit per vertex or per pixel")
+    ap.add_argument("--step", type=float, default=1/60)
+    ap.add_argument("--seed", type=int)
+    add_scene_args(ap)
+    return ap.parse_args(argv)
+
+def run(args):
+    w, h = args.size
+    # PyOpenGL must see the offscreen platform before its first import
+    offscreen.use_platform()
+    from OpenGL.GL import glFlush
+    from campground.render.capture import FrameTarget, PixelReader, FrameWriter, open_sink
+    from campground.render.scene import SceneRenderer
+    # The pbuffer is never drawn to; everything goes into the framebuffer object
+    ctx = offscreen.create_context(16, 16)
+    sim = open_simulation(args.step, args.seed, args.sites, args.scene)
+    apply_options(sim, args)
+
+    cam = Camera()
+    x, y, z, yaw, pitch = map(float, args.camera.split(","))
+    cam.look((x, y, z), yaw, pitch)
+    sim.weather.follow(cam.position)
+
+    target = FrameTarget(w, h)
+    target.bind()
+    renderer = SceneRenderer(cam, sim, size=(w, h), shaders=args.shaders)
+    reader = PixelReader(w, h, args.pbos)
+    writer = FrameWriter(open_sink(args.out, w, h, args.level), args.queue)
+    sim.run(args.warmup)
+    prof = sim.profiler = Profiler(window=max(args.frames, 1))
+    step = sim.stepper.step
+    t0 = time.perf_counter()
+    try:
+        for i in range(args.frames):
+            prof.begin_frame()
+            for _ in range(args.every):
+                sim.tick(step)
+            renderer.render(sim)
+            with prof.scope("capture.read"):
+                glFlush()
+                done = reader.read(i)
+            with prof.scope("capture.queue"):
+                if done:
+                    writer.write(*done)
+            prof.end_frame()
+        for done in reader.drain():
+            writer.write(*done)
+    finally:
+        writer.close()
+        reader.delete()
+        renderer.delete()
+        target.delete()
+        ctx.destroy()
+    wall = time.perf_counter() - t0
+    return wall, writer, prof.summary()
+
+def cli(argv=None):
+    args = parse_args(argv)
+    wall, writer, summary = run(args)
+    print("%d frames (%dx%d) in %.2fs, %.1f fps; writer stalled %d times"
+          % (writer.written, args.size[0], args.size[1], wall, writer.written / wall if wall else 0.0, writer.stalls), file=sys.stderr)
+    for name in ("frame", "weather.update", "render.trees", "capture.read", "capture.queue"):
+        s = summary.get(name)
+        if s:
+            print("%-14s mean %6.2f ms  p95 %6.2f ms" % (name, s["mean"], s["p95"]), file=sys.stderr)
+
+if __name__ == "__main__":
+    cli()
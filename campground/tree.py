@@ -0,0 +1,16 @@
+from campground.lsystem import LSystem
+
+axiom      = "F"
+rules      = {"F": "FF+[+F-F-F]-[-F+F+F]"}
+iterations = 3
+
+class Tree:
+    def __init__(self, position, scale, rotation, params):
+        self.position = position
+        self.scale    = scale
+        self.rotation = rotation
+        self.lsys = LSystem(params.get("axiom", axiom), params.get("rules", rules),
+                            params.get("iterations", iterations))
+
+    def transform(self):
+        return (*self.position, self.rotation[1], self.scale[0], self.scale[1])
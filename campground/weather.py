@@ -0,0 +1,189 @@
+import numpy as np
+from campground.heightmap import HeightPatch
+from campground.particles import RainPool, SplashPool
+from campground.schedule import Scheduler
+
+rain_cap  = 1000
+rain_rate = 600.0
+# Rain fills a square of this half-width around `center`, falling from this band above it
+rain_half = 20.0
+rain_band = (10.0, 20.0)
+_rain_lo  = np.array((-rain_half, rain_band[0], -rain_half))
+_rain_hi  = np.array((rain_half, rain_band[1], rain_half))
+wind      = (1.5, 0.5)
+
+# Per state: fog density, rain intensity (share of rain_rate) and lightning strikes per minute
+states = {
+    "clear":    (0.0,   0.0, 0.0),
+    "overcast": (0.004, 0.0, 0.0),
+    "rain":     (0.008, 0.6, 0.0),
+    "storm":    (0.012, 1.0, 6.0),
+}
+# The automatic cycle: mean seconds spent in each state and where it can go next
+durations  = {"clear": 240.0, "overcast": 120.0, "rain": 180.0, "storm": 90.0}
+follows    = {"clear": ("overcast",), "overcast": ("clear", "rain"), "rain": ("overcast", "storm"), "storm": ("rain",)}
+blend_time = 6.0
+mist       = 0.02
+flash      = (0.05, 0.2)
+
+class WeatherSystem:
+    # A state machine (clear, overcast, rain, storm) run by timers on weather time. Changing
+    # state blends fog and rain toward the new targets over `blend` seconds; lightning strikes
+    # are a Poisson process, each gap drawn when the previous strike lands. Between timers
+    # and with nothing blending or falling, update() only advances the clock.
+    #
+    # The rain volume follows `center` (the camera, via follow()) and wraps toroidally, so
+    # the same pool of drops covers an unbounded world.
+    def __init__(self, rain_cap=rain_cap, rain_rate=rain_rate, rng=None, ground=None):
+        self.rng                 = rng or np.random.default_rng()
+        self.rain_particles      = RainPool(rain_cap)
+        self.splashes            = SplashPool(2 * rain_cap)
+        self.rain_rate           = rain_rate
+        self.rain_carry          = 0.0
+        self.center              = np.zeros(3)
+        self.wind                = np.array(wind)
+        self.ground              = HeightPatch(ground, rain_half) if ground is not None else None
+        self.timers              = Scheduler()
+        self.now                 = 0.0
+        self.state               = "clear"
+        self.auto                = False
+        self.mist                = 0.0
+        self.fog_density         = 0.0
+        self.rain_intensity      = 0.0
+        self.blend               = None
+        self.lightning_active    = False
+        self.lightning_intensity = 0.0
+        self.strikes             = 0
+
+    @property
+    def rain_enabled(self):
+        return self.rain_intensity > 0
+
+    @property
+    def lightning_enabled(self):
+        return states[self.state][2] > 0
+
+    def follow(self, pos):
+        self.center[:] = pos
+
+    def spawn_rain(self, n):
+        return self.rain_particles.spawn(n, self.center + _rain_lo, self.center + _rain_hi, rng=self.rng)
+
+    def set_state(self, name, blend=blend_time, at=None):
+        # Head for `name` from wherever the blend currently is. Strikes and, with `auto`, the
+        # next change are rescheduled from `at`, the weather time the change happens.
+        at = self.now if at is None else at
+        self.state = name
+        self.retarget(blend, at)
+        per_min = states[name][2]
+        if per_min > 0:
+            if "strike" not in self.timers.pending:
+                self.timers.at(at + self.rng.exponential(60.0 / per_min), "strike")
+        else:
+            self.timers.cancel("strike")
+        if self.auto:
+            self.timers.at(at + self.rng.exponential(durations[name]), "change")
+        else:
+            self.timers.cancel("change")
+
+    def retarget(self, blend=blend_time, at=None):
+        at = self.now if at is None else at
+        fog, rain, _ = states[self.state]
+        target = (fog + self.mist, rain)
+        if blend <= 0:
+            self.fog_density, self.rain_intensity = target
+            self.blend = None
+        else:
+            self.blend = (at, blend, self.fog_density, self.rain_intensity) + target
+
+    def set_auto(self, on):
+        self.auto = on
+        self.set_state(self.state, blend=0.0 if self.blend is None else self.blend[1])
+
+    def on_strike(self, t, arg):
+        self.lightning_active    = True
+        self.lightning_intensity = self.rng.uniform(0.5, 1.0)
+        self.strikes += 1
+        self.timers.at(t + self.rng.uniform(*flash), "flash_end")
+        self.timers.at(t + self.rng.exponential(60.0 / states[self.state][2]), "strike")
+
+    def on_flash_end(self, t, arg):
+        self.lightning_active    = False
+        self.lightning_intensity = 0.0
+
+    def on_change(self, t, arg):
+        nxt = follows[self.state]
+        self.set_state(nxt[int(self.rng.integers(len(nxt)))], at=t)
+
+    def update(self, dt):
+        self.now += dt
+        for t, name, arg in self.timers.due(self.now):
+            getattr(self, "on_" + name)(t, arg)
+
+        if self.blend is not None:
+            t0, length, fog0, rain0, fog1, rain1 = self.blend
+            f = min((self.now - t0) / length, 1.0)
+            self.fog_density    = fog0 + (fog1 - fog0) * f
+            self.rain_intensity = rain0 + (rain1 - rain0) * f
+            if f >= 1.0:
+                self.blend = None
+
+        # Rain: spawn at the current intensity; drops already falling land even once it stops
+        if self.rain_intensity > 0:
+            self.rain_carry += self.rain_rate * self.rain_intensity * dt
+            n = int(self.rain_carry)
+            self.rain_carry -= n
+            self.spawn_rain(n)
+        else:
+            self.rain_carry = 0.0
+        if len(self.rain_particles) or len(self.splashes):
+            cx, _, cz = self.center
+            ground = ceiling = None
+            if self.ground is not None:
+                self.ground.follow(cx, cz)
+                ground, ceiling = self.ground.height_at, self.ground.top
+            hits = self.rain_particles.update(dt, self.wind, (cx - rain_half, cz - rain_half, 2 * rain_half),
+                                              ground, ceiling)
+            self.splashes.update(dt)
+            self.splashes.burst(hits, rng=self.rng)
+
+    def quiet(self):
+        # Nothing blending, falling or splashing: until the next timer an update only moves the clock
+        return (self.blend is None and self.rain_intensity <= 0
+                and not len(self.rain_particles) and not len(self.splashes))
+
+    def coast(self, dt, limit):
+        # Up to `limit` updates of a quiet system, stopping short of the next timer. The clock
+        # moves exactly as that many update(dt) calls would move it; returns how many that was.
+        due, now, n = self.timers.next_time(), self.now, 0
+        while n < limit and now + dt < due:
+            now += dt
+            n += 1
+        self.now        = now
+        self.rain_carry = 0.0
+        return n
+
+    def toggle_rain(self, blend=blend_time):
+        self.set_state("clear" if self.state in ("rain", "storm") else "rain", blend)
+
+    def toggle_lightning(self, blend=blend_time):
+        self.set_state("rain" if self.state == "storm" else "storm", blend)
+
+    def toggle_fog(self, blend=blend_time):
+        self.mist = 0.0 if self.mist else mist
+        self.retarget(blend)
+
+    def to_dict(self):
+        return {"state": self.state, "auto": self.auto, "mist": self.mist, "now": self.now,
+                "fog_density": self.fog_density, "rain_intensity": self.rain_intensity, "rain_rate": self.rain_rate,
+                "rain_carry": self.rain_carry, "blend": self.blend, "lightning_active": self.lightning_active,
+                "lightning_intensity": self.lightning_intensity, "strikes": self.strikes,
+                "timers": self.timers.to_list()}
+
+    def load_dict(self, d):
+        timers, blend = d["timers"], d["blend"]
+        for k, v in d.items():
+            setattr(self, k, v)
+        self.blend = tuple(blend) if blend is not None else None
+        self.timers = Scheduler()
+        self.timers.load(timers)